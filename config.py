@@ -3,11 +3,40 @@ Configuration module for TalentScout Hiring Assistant.
 Manages application settings and constants.
 """
 
+import functools
 import os
+import re
+from enum import IntFlag
 from dotenv import load_dotenv
 
+# Guard so repeated imports/reloads don't re-read .env
+_DOTENV_LOADED = False
+
+
+def load_env_once():
+    """Load environment variables from .env the first time only."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
 # Load environment variables
-load_dotenv()
+load_env_once()
+
+
+def _technologies_pattern(technologies, case_sensitive) -> re.Pattern:
+    """
+    Build one case-insensitive alternation over technology names.
+    
+    Names in case_sensitive only match with their listed spelling. Names
+    are tried longest first so "JavaScript" wins over "Java".
+    """
+    alternatives = (
+        f"(?-i:{re.escape(tech)})" if tech in case_sensitive else re.escape(tech)
+        for tech in sorted(technologies, key=len, reverse=True)
+    )
+    return re.compile(r'(?<!\w)(?:' + '|'.join(alternatives) + r')(?![\w+#])', re.IGNORECASE)
 
 
 class Config:
@@ -30,6 +59,8 @@ class Config:
     DATA_DIR = os.getenv("DATA_DIR", "data/candidate_info")
     DATA_SALT = os.getenv("DATA_SALT", "salt_2024_talentscout")
     DATA_RETENTION_DAYS = int(os.getenv("DATA_RETENTION_DAYS", "90"))
+    # Seconds between grouped fsyncs of saved records (0: leave to the OS)
+    DATA_FSYNC_INTERVAL = float(os.getenv("DATA_FSYNC_INTERVAL", "0"))
     
     # Conversation Configuration
     MAX_CONVERSATION_HISTORY = 10
@@ -59,7 +90,7 @@ class Config:
         'React', 'Vue', 'Angular', 'Svelte', 'Next.js', 'Nuxt', 'jQuery',
         
         # Backend Frameworks
-        'Django', 'Flask', 'FastAPI', 'Spring', 'Express', 'NestJS', 'Laravel', 'ASP.NET', 'Rails',
+        'Node.js', 'Django', 'Flask', 'FastAPI', 'Spring', 'Express', 'NestJS', 'Laravel', 'ASP.NET', 'Rails',
         
         # Databases
         'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Cassandra', 'Firebase', 'DynamoDB',
@@ -75,17 +106,71 @@ class Config:
         'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Keras',
         
         # Other Tools
-        'Git', 'Docker', 'Kubernetes', 'Jenkins', 'Apache', 'Nginx', 'RabbitMQ', 'Kafka'
+        'Apache', 'Nginx', 'RabbitMQ', 'Kafka'
     ]
     
+    # Lowercased lookup set for O(1) case-insensitive membership checks
+    COMMON_TECHNOLOGIES_SET: frozenset[str] = frozenset(map(str.lower, COMMON_TECHNOLOGIES))
+    
+    # Lowercased name -> canonical spelling
+    COMMON_TECHNOLOGIES_CANONICAL: dict = dict(zip(map(str.lower, COMMON_TECHNOLOGIES), COMMON_TECHNOLOGIES))
+    
+    # Technologies that are also ordinary English words ("I'd like to go",
+    # "rest of the team"); free text only matches their listed spelling
+    COMMON_WORD_TECHNOLOGIES: frozenset[str] = frozenset({
+        'Go', 'R', 'Rust', 'Ruby', 'Swift', 'Dart', 'React', 'Angular', 'Flask',
+        'Spring', 'Express', 'Rails', 'Oracle', 'REST', 'Apache', 'Pandas'
+    })
+    
+    # One alternation over all technologies, matched in a single pass
+    COMMON_TECHNOLOGIES_PATTERN = _technologies_pattern(COMMON_TECHNOLOGIES, COMMON_WORD_TECHNOLOGIES)
+    
+    @classmethod
+    def is_known_tech(cls, name: str) -> bool:
+        """
+        Check whether a technology is in the common technologies list.
+        
+        Args:
+            name: Technology name (case-insensitive)
+            
+        Returns:
+            True if the technology is known
+        """
+        return name.strip().lower() in cls.COMMON_TECHNOLOGIES_SET
+    
+    @classmethod
+    def extract_technologies(cls, text: str) -> list:
+        """
+        Find common technologies mentioned in free text.
+        
+        Args:
+            text: User message to scan
+            
+        Returns:
+            Canonical technology names in order of first mention, without duplicates
+        """
+        found = {}
+        for match in cls.COMMON_TECHNOLOGIES_PATTERN.finditer(text):
+            found.setdefault(cls.COMMON_TECHNOLOGIES_CANONICAL[match.group().lower()], None)
+        return list(found)
+    
     @classmethod
     def validate(cls) -> bool:
         """
         Validate critical configuration.
         
+        The result is cached after the first successful call; a failed
+        validation raises and is retried on the next call.
+        
         Returns:
             True if configuration is valid
         """
+        return cls._validate_cached()
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _validate_cached(cls) -> bool:
+        """Run the configuration checks (cached by validate)."""
         if cls.LLM_PROVIDER == "gemini":
             if not cls.GEMINI_API_KEY:
                 raise ValueError("GEMINI_API_KEY not set in environment variables")
@@ -133,14 +218,48 @@ class LogConfig:
 
 
 # Feature flags
+class Feature(IntFlag):
+    """Bit values for experimental features."""
+    
+    SENTIMENT_ANALYSIS = 1
+    MULTILINGUAL = 2
+    RESUME_PARSING = 4
+    VIDEO_INTERVIEW = 8
+    EMAIL_NOTIFICATIONS = 16
+
+
+def parse_feature_flags(raw: str) -> Feature:
+    """
+    Parse the FEATURE_FLAGS value into a Feature bitmask.
+    
+    Args:
+        raw: Integer mask ("5", "0x5") or comma list of names ("sentiment_analysis,email_notifications")
+        
+    Returns:
+        Combined Feature flags
+    """
+    raw = raw.strip()
+    if not raw:
+        return Feature(0)
+    try:
+        return Feature(int(raw, 0))
+    except ValueError:
+        flags = Feature(0)
+        for name in raw.split(","):
+            flags |= Feature.__members__.get(name.strip().upper(), Feature(0))
+        return flags
+
+
 class FeatureFlags:
     """Feature flags for experimental features."""
     
-    ENABLE_SENTIMENT_ANALYSIS = os.getenv("ENABLE_SENTIMENT_ANALYSIS", "false").lower() == "true"
-    ENABLE_MULTILINGUAL = os.getenv("ENABLE_MULTILINGUAL", "false").lower() == "true"
-    ENABLE_RESUME_PARSING = os.getenv("ENABLE_RESUME_PARSING", "false").lower() == "true"
-    ENABLE_VIDEO_INTERVIEW = os.getenv("ENABLE_VIDEO_INTERVIEW", "false").lower() == "true"
-    ENABLE_EMAIL_NOTIFICATIONS = os.getenv("ENABLE_EMAIL_NOTIFICATIONS", "false").lower() == "true"
+    FLAGS = parse_feature_flags(os.getenv("FEATURE_FLAGS", "0"))
+    
+    ENABLE_SENTIMENT_ANALYSIS = bool(FLAGS & Feature.SENTIMENT_ANALYSIS)
+    ENABLE_MULTILINGUAL = bool(FLAGS & Feature.MULTILINGUAL)
+    ENABLE_RESUME_PARSING = bool(FLAGS & Feature.RESUME_PARSING)
+    ENABLE_VIDEO_INTERVIEW = bool(FLAGS & Feature.VIDEO_INTERVIEW)
+    ENABLE_EMAIL_NOTIFICATIONS = bool(FLAGS & Feature.EMAIL_NOTIFICATIONS)
 
 
 if __name__ == "__main__":
@@ -148,4 +267,16 @@ if __name__ == "__main__":
     print(f"Model: {Config.LLM_MODEL}")
     print(f"Data Directory: {Config.DATA_DIR}")
     print(f"Data Retention: {Config.DATA_RETENTION_DAYS} days")
-    print(f"API Key Set: {'Yes' if Config.OPENAI_API_KEY else 'No'}")
+    print(f"Provider: {Config.LLM_PROVIDER}")
+    if Config.LLM_PROVIDER == "gemini":
+        print(f"API Key Set: {'Yes' if Config.GEMINI_API_KEY else 'No'}")
+    else:
+        print(f"Ollama URL: {Config.OLLAMA_BASE_URL}")
+    
+    import time
+    start = time.perf_counter()
+    try:
+        Config.validate()
+        print(f"Validation: OK ({(time.perf_counter() - start) * 1e6:.1f}µs)")
+    except ValueError as e:
+        print(f"Validation: {e}")
@@ -3,27 +3,42 @@ Core chatbot logic and conversation management for TalentScout Hiring Assistant.
 Handles context management, prompt engineering, and LLM interactions.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from enum import Enum
-import json
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Deque, Tuple, Final
+from collections import deque
+from itertools import islice
+from enum import IntEnum
+from functools import lru_cache
+import re
+import sys
 
+# Interned message roles shared by every history entry
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
 
-class ConversationState(Enum):
+# Precomputed uppercase tags used when rendering the LLM context
+_ROLE_TAGS = {ROLE_USER: "USER", ROLE_ASSISTANT: "ASSISTANT", "system": "SYSTEM"}
+
+
+class ConversationState(IntEnum):
     """Enum for different conversation states."""
-    GREETING = "greeting"
-    NAME_COLLECTION = "name_collection"
-    CONTACT_COLLECTION = "contact_collection"
-    EXPERIENCE_COLLECTION = "experience_collection"
-    POSITION_COLLECTION = "position_collection"
-    LOCATION_COLLECTION = "location_collection"
-    TECH_STACK_COLLECTION = "tech_stack_collection"
-    TECHNICAL_QUESTIONS = "technical_questions"
-    CLOSING = "closing"
-    ENDED = "ended"
-
-
-@dataclass
+    GREETING = 0
+    NAME_COLLECTION = 1
+    CONTACT_COLLECTION = 2
+    EXPERIENCE_COLLECTION = 3
+    POSITION_COLLECTION = 4
+    LOCATION_COLLECTION = 5
+    TECH_STACK_COLLECTION = 6
+    TECHNICAL_QUESTIONS = 7
+    CLOSING = 8
+    ENDED = 9
+
+    def __str__(self) -> str:
+        """Readable state name for logging, e.g. "name_collection"."""
+        return self.name.lower()
+
+
+@dataclass(slots=True)
 class CandidateInfo:
     """Data class to store candidate information."""
     full_name: Optional[str] = None
@@ -33,54 +48,111 @@ class CandidateInfo:
     desired_positions: Optional[str] = None
     current_location: Optional[str] = None
     tech_stack: Optional[List[str]] = field(default_factory=list)
-    technical_responses: Dict[str, str] = field(default_factory=dict)
+    # Answers in question order, parallel to ConversationManager.generated_questions
+    technical_responses: List[str] = field(default_factory=list)
+    # Per-answer scores (0-10) and overall summary from the batched evaluation
+    technical_scores: List[int] = field(default_factory=list)
+    technical_summary: Optional[str] = None
+
+    @property
+    def tech_stack_normalized(self) -> frozenset[str]:
+        """Lowercased, deduplicated view of tech_stack for set lookups/intersections."""
+        return frozenset(tech.strip().lower() for tech in self.tech_stack or ())
 
     def to_dict(self):
-        """Convert candidate info to dictionary."""
-        return {
-            "full_name": self.full_name,
-            "email": self.email,
-            "phone": self.phone,
-            "years_of_experience": self.years_of_experience,
-            "desired_positions": self.desired_positions,
-            "current_location": self.current_location,
-            "tech_stack": self.tech_stack,
-            "technical_responses": self.technical_responses
-        }
+        """Convert candidate info to dictionary (lists are copied, like asdict)."""
+        data = {}
+        for name in _EXPORT_FIELDS:
+            value = getattr(self, name)
+            data[name] = value.copy() if isinstance(value, list) else value
+        return data
+
+
+# Field names accepted by ConversationManager.update_candidate_info
+_CANDIDATE_FIELDS = frozenset(f.name for f in fields(CandidateInfo))
+
+# Fields exported by to_dict, in declaration order
+_EXPORT_FIELDS = tuple(f.name for f in fields(CandidateInfo))
 
 
 class ConversationManager:
     """Manages the conversation flow and context for the hiring assistant."""
 
+    __slots__ = (
+        'state', 'candidate_info', 'conversation_history',
+        'current_question_index', 'generated_questions',
+        'first_message', 'message_count'
+    )
+
     # Exit keywords that end the conversation
-    EXIT_KEYWORDS = ['exit', 'quit', 'goodbye', 'bye', 'leave', 'end', 'stop']
+    EXIT_KEYWORDS = ('exit', 'quit', 'goodbye', 'bye', 'leave', 'end', 'stop')
+
+    # Single precompiled pattern derived from EXIT_KEYWORDS (whole words only)
+    EXIT_PATTERN = re.compile(
+        r'\b(?:' + '|'.join(map(re.escape, EXIT_KEYWORDS)) + r')\b',
+        re.IGNORECASE
+    )
+
+    # Maximum messages kept in memory (mirrors Config.MAX_CONVERSATION_HISTORY)
+    MAX_HISTORY = 10
+
+    # Candidate fields that must be filled before the interview can close
+    REQUIRED_FIELDS = (
+        'full_name', 'email', 'phone', 'years_of_experience',
+        'desired_positions', 'current_location', 'tech_stack'
+    )
+
+    # Number of recent messages included in the LLM context
+    CONTEXT_WINDOW = 6
 
     def __init__(self):
         """Initialize conversation manager."""
         self.state: ConversationState = ConversationState.GREETING
         self.candidate_info = CandidateInfo()
-        self.conversation_history: List[Dict[str, str]] = []
+        self.conversation_history: Deque[Tuple[str, str]] = deque(maxlen=self.MAX_HISTORY)
         self.current_question_index = 0
         self.generated_questions: List[str] = []
+        # Opening message, kept even after the deque evicts it
+        self.first_message: Optional[Tuple[str, str]] = None
+        self.message_count = 0
 
     def is_exit_intent(self, user_input: str) -> bool:
         """Check if user input contains exit keywords."""
-        user_lower = user_input.lower().strip()
-        return any(keyword in user_lower for keyword in self.EXIT_KEYWORDS)
+        return bool(self.EXIT_PATTERN.search(user_input))
 
     def add_to_history(self, role: str, content: str):
-        """Add message to conversation history."""
-        self.conversation_history.append({
-            "role": role,
-            "content": content
-        })
+        """Add message to conversation history as a (role, content) tuple."""
+        message = (sys.intern(role), content)
+        if self.first_message is None:
+            self.first_message = message
+        self.conversation_history.append(message)
+        self.message_count += 1
+
+    def windowed_history(self, k: int = 8) -> List[Tuple[str, str]]:
+        """
+        Get the last k messages, prefixed by the opening message once it
+        falls outside the window, so the prompt prefix stays stable.
+        
+        Args:
+            k: Number of recent messages to keep (capped at MAX_HISTORY)
+            
+        Returns:
+            List of (role, content) tuples
+        """
+        k = min(k, self.MAX_HISTORY)
+        recent = list(islice(self.conversation_history, max(0, len(self.conversation_history) - k), None))
+        if self.message_count > k:
+            return [self.first_message] + recent
+        return recent
 
     def get_conversation_context(self) -> str:
         """Get formatted conversation context for LLM."""
-        context = "Conversation History:\n"
-        for msg in self.conversation_history[-6:]:  # Last 6 messages for context
-            context += f"{msg['role'].upper()}: {msg['content']}\n"
-        return context
+        start = max(0, len(self.conversation_history) - self.CONTEXT_WINDOW)
+        lines = [
+            f"{_ROLE_TAGS.get(role) or role.upper()}: {content}"
+            for role, content in islice(self.conversation_history, start, None)
+        ]
+        return "Conversation History:\n" + "\n".join(lines) + ("\n" if lines else "")
 
     def set_state(self, new_state: ConversationState):
         """Transition to a new conversation state."""
@@ -92,7 +164,7 @@ class ConversationManager:
 
     def update_candidate_info(self, field: str, value):
         """Update candidate information."""
-        if hasattr(self.candidate_info, field):
+        if field in _CANDIDATE_FIELDS:
             setattr(self.candidate_info, field, value)
 
     def get_candidate_info(self) -> CandidateInfo:
@@ -112,30 +184,41 @@ class ConversationManager:
             return question
         return None
 
+    def record_technical_answer(self, answer: str):
+        """
+        Store the answer to the most recently asked question.
+        
+        technical_responses[i] is always the answer to generated_questions[i];
+        an answer that would land at any other index is rejected.
+        
+        Raises:
+            ValueError: If the answer would not line up with the last asked question
+        """
+        responses = self.candidate_info.technical_responses
+        if len(responses) != self.current_question_index - 1:
+            raise ValueError(
+                f"Answer {len(responses) + 1} does not match asked question "
+                f"{self.current_question_index}"
+            )
+        responses.append(answer)
+
+    def get_technical_qa_pairs(self) -> List[Tuple[str, str]]:
+        """Pair each asked question with the candidate's answer."""
+        responses = self.candidate_info.technical_responses
+        return list(zip(self.generated_questions[:len(responses)], responses, strict=True))
+
     def has_more_questions(self) -> bool:
         """Check if there are more questions to ask."""
         return self.current_question_index < len(self.generated_questions)
 
     def is_info_complete(self) -> bool:
         """Check if all required candidate info is collected."""
-        return all([
-            self.candidate_info.full_name,
-            self.candidate_info.email,
-            self.candidate_info.phone,
-            self.candidate_info.years_of_experience,
-            self.candidate_info.desired_positions,
-            self.candidate_info.current_location,
-            self.candidate_info.tech_stack
-        ])
-
+        info = self.candidate_info
+        return all(getattr(info, name) for name in self.REQUIRED_FIELDS)
 
-class PromptManager:
-    """Manages all prompts for the chatbot."""
 
-    @staticmethod
-    def get_system_prompt() -> str:
-        """Get the system prompt for the chatbot."""
-        return """You are TalentScout, an intelligent hiring assistant for a technology recruitment agency. 
+# Static prompts, defined once at import time
+_SYSTEM_PROMPT: Final[str] = """You are TalentScout, an intelligent hiring assistant for a technology recruitment agency. 
 Your role is to conduct initial screening interviews with candidates for technology positions.
 
 RESPONSIBILITIES:
@@ -155,33 +238,22 @@ CONSTRAINTS:
 
 When collecting information, do so conversationally - don't list all questions at once."""
 
-    @staticmethod
-    def get_greeting_prompt() -> str:
-        """Get the greeting prompt."""
-        return """Welcome the candidate to TalentScout's Hiring Assistant. 
+_GREETING_PROMPT: Final[str] = """Welcome the candidate to TalentScout's Hiring Assistant. 
 Briefly explain that you're an AI assistant here to help conduct their initial screening interview.
 Ask them for their full name to start the process.
 Keep it warm, professional, and encouraging."""
 
-    @staticmethod
-    def get_info_gathering_prompt(field: str, candidate_name: str = "") -> str:
-        """Get prompts for gathering specific candidate information."""
-        prompts = {
-            "name": f"Ask the candidate for their full name if you don't have it yet.",
-            "email": f"Ask {candidate_name} for their email address. Mention it will be used for follow-up communication.",
-            "phone": f"Ask {candidate_name} for their phone number where they can be reached.",
-            "experience": f"Ask {candidate_name} how many years of experience they have in software development/technology.",
-            "position": f"Ask {candidate_name} what position(s) they're interested in at our recruitment agency.",
-            "location": f"Ask {candidate_name} their current location or preferred working location.",
-            "tech_stack": f"Ask {candidate_name} about their technical skills and tech stack. Include: programming languages, frameworks, databases, and tools they're proficient with. Ask them to list several technologies."
-        }
-        return prompts.get(field, "")
-
-    @staticmethod
-    def get_tech_questions_generation_prompt(tech_stack: List[str]) -> str:
-        """Get prompt to generate technical questions."""
-        tech_list = ", ".join(tech_stack)
-        return f"""Generate 4-5 technical questions tailored to assess a candidate's proficiency in the following technologies: {tech_list}
+_FALLBACK_PROMPT: Final[str] = """The user input was unclear or off-topic. Politely acknowledge this and:
+1. Apologize for not understanding
+2. Briefly remind them of what you're here to help with (hiring screening)
+3. Ask them to rephrase or redirect them back to the screening process
+Keep it concise and helpful."""
+
+# Tech-questions prompt split around the interpolated tech list so the
+# static parts stay constant (and cacheable by the LLM provider)
+_TECH_QUESTIONS_PROMPT_PREFIX: Final[str] = "Generate 4-5 technical questions tailored to assess a candidate's proficiency in the following technologies: "
+
+_TECH_QUESTIONS_PROMPT_SUFFIX: Final[str] = """
 
 Requirements:
 - Questions should be practical and relevant to real-world scenarios
@@ -196,24 +268,90 @@ Example format:
 2. [Question about tech 2]
 etc."""
 
-    @staticmethod
-    def get_fallback_prompt() -> str:
-        """Get fallback prompt when chatbot doesn't understand."""
-        return """The user input was unclear or off-topic. Politely acknowledge this and:
-1. Apologize for not understanding
-2. Briefly remind them of what you're here to help with (hiring screening)
-3. Ask them to rephrase or redirect them back to the screening process
-Keep it concise and helpful."""
+# Info-gathering prompt builders, keyed by field; built once at import time
+_INFO_PROMPTS = {
+    "name": lambda name: "Ask the candidate for their full name if you don't have it yet.",
+    "email": lambda name: f"Ask {name} for their email address. Mention it will be used for follow-up communication.",
+    "phone": lambda name: f"Ask {name} for their phone number where they can be reached.",
+    "experience": lambda name: f"Ask {name} how many years of experience they have in software development/technology.",
+    "position": lambda name: f"Ask {name} what position(s) they're interested in at our recruitment agency.",
+    "location": lambda name: f"Ask {name} their current location or preferred working location.",
+    "tech_stack": lambda name: f"Ask {name} about their technical skills and tech stack. Include: programming languages, frameworks, databases, and tools they're proficient with. Ask them to list several technologies."
+}
+
+
+def get_system_prompt() -> str:
+    """Get the system prompt for the chatbot."""
+    return _SYSTEM_PROMPT
+
+
+def get_greeting_prompt() -> str:
+    """Get the greeting prompt."""
+    return _GREETING_PROMPT
+
+
+def get_info_gathering_prompt(field: str, candidate_name: str = "") -> str:
+    """Get prompts for gathering specific candidate information."""
+    prompt_fn = _INFO_PROMPTS.get(field)
+    return prompt_fn(candidate_name) if prompt_fn else ""
+
+
+def get_tech_questions_generation_prompt(tech_stack: List[str]) -> str:
+    """Get prompt to generate technical questions."""
+    return _tech_questions_prompt(tuple(tech_stack))
+
 
-    @staticmethod
-    def get_closing_prompt(candidate_name: str) -> str:
-        """Get closing prompt."""
-        return f"""Thank {candidate_name} for their time in this screening interview.
+@lru_cache(maxsize=64)
+def _tech_questions_prompt(tech_stack: Tuple[str, ...]) -> str:
+    """Build (once per distinct, ordered stack) the tech-questions prompt."""
+    return _TECH_QUESTIONS_PROMPT_PREFIX + ", ".join(tech_stack) + _TECH_QUESTIONS_PROMPT_SUFFIX
+
+
+def get_fallback_prompt() -> str:
+    """Get fallback prompt when chatbot doesn't understand."""
+    return _FALLBACK_PROMPT
+
+
+@lru_cache(maxsize=64)
+def get_closing_prompt(candidate_name: str) -> str:
+    """Get closing prompt."""
+    return f"""Thank {candidate_name} for their time in this screening interview.
 Summarize what you've learned about them (key tech stack, experience level).
 Inform them about next steps: mention that their information will be reviewed and they'll be contacted within 2-3 business days if there's a suitable match.
 Keep it professional, warm, and encouraging."""
 
 
+def get_answer_evaluation_prompt(qa_pairs: List[Tuple[str, str]]) -> str:
+    """Get prompt to score all technical answers in a single request."""
+    answers = "\n\n".join(
+        f"Q{i}: {question}\nA{i}: {answer}" for i, (question, answer) in enumerate(qa_pairs, 1)
+    )
+    return f"""Evaluate the candidate's answers to the following technical interview questions.
+
+{answers}
+
+Score each answer from 0 (no understanding) to 10 (expert), in question order, and write a 2-3 sentence summary of the candidate's technical strengths and gaps.
+Return ONLY a JSON object in this exact format, with no additional text:
+{{"scores": [<int>, ...], "summary": "<text>"}}"""
+
+
+class PromptManager:
+    """
+    Namespace shim over the module-level prompt functions.
+    Kept for existing callers; new code should call the functions directly.
+    """
+
+    __slots__ = ()
+
+    get_system_prompt = staticmethod(get_system_prompt)
+    get_greeting_prompt = staticmethod(get_greeting_prompt)
+    get_info_gathering_prompt = staticmethod(get_info_gathering_prompt)
+    get_tech_questions_generation_prompt = staticmethod(get_tech_questions_generation_prompt)
+    get_answer_evaluation_prompt = staticmethod(get_answer_evaluation_prompt)
+    get_fallback_prompt = staticmethod(get_fallback_prompt)
+    get_closing_prompt = staticmethod(get_closing_prompt)
+
+
 # Example usage and testing
 if __name__ == "__main__":
     manager = ConversationManager()
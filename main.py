@@ -3,14 +3,36 @@ LLM Integration module for TalentScout Hiring Assistant.
 Handles communication with Google Gemini or Ollama APIs.
 """
 
+import asyncio
+import atexit
+import hashlib
+import importlib.util
+import inspect
+import json
 import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
-from typing import Optional, List, Tuple
-from dotenv import load_dotenv
-from core import ConversationManager, PromptManager, ConversationState
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, List, Tuple, Iterator
+from functools import lru_cache
+from config import Config, load_env_once
+from core import (
+    ConversationManager, ConversationState, ROLE_USER, ROLE_ASSISTANT,
+    get_system_prompt, get_greeting_prompt, get_fallback_prompt,
+    get_tech_questions_generation_prompt, get_closing_prompt, get_answer_evaluation_prompt
+)
 
 # Load environment variables
-load_dotenv()
+load_env_once()
+
+# Static prompts resolved once at import
+_SYSTEM_PROMPT = get_system_prompt()
+_GREETING_PROMPT = get_greeting_prompt()
+_FALLBACK_PROMPT = get_fallback_prompt()
 
 # Try to import Google Generative AI
 try:
@@ -19,9 +41,230 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
+# Faster JSON for Ollama request/response bodies when orjson is installed
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+    _json_loads = json.loads
+
+# Newer google-generativeai releases accept the system prompt as a model-level
+# instruction, which keeps it out of every request body
+GEMINI_SYSTEM_INSTRUCTION = (
+    GEMINI_AVAILABLE
+    and "system_instruction" in inspect.signature(genai.GenerativeModel).parameters
+)
+
+# Optional semantic matching for the question cache; loaded lazily on first use
+# because importing sentence-transformers pulls in torch
+SEMANTIC_CACHE_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None for name in ("sentence_transformers", "numpy")
+)
+
+
+class ResponseCache:
+    """Thread-safe in-process LRU cache of LLM responses keyed by exact prompt."""
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of responses kept before evicting the oldest
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: float, messages: List[dict],
+                 max_tokens: Optional[int] = None) -> str:
+        """Hash the full request into a cache key."""
+        payload = json.dumps([provider, model, temperature, messages, max_tokens], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response and mark it recently used."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: str):
+        """Store a response, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class QuestionCache:
+    """
+    Cache of generated technical questions keyed by tech stack.
+    
+    Stacks that normalize to the same set of technologies always hit. When
+    sentence-transformers is installed, near-identical stacks (cosine
+    similarity above the threshold) also reuse the cached questions.
+    """
+
+    EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+    def __init__(self, max_entries: int = 256, similarity_threshold: float = 0.92):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of question sets kept
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._vectors: dict = {}
+        self._embedder = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tech_stack: List[str]) -> str:
+        """Normalize a tech stack into an order- and case-insensitive key."""
+        return " ".join(sorted({tech.strip().lower() for tech in tech_stack}))
+
+    def _embed(self, key: str):
+        """Embed a stack key, loading the model on first use."""
+        if self._embedder is None:
+            from sentence_transformers import SentenceTransformer
+            self._embedder = SentenceTransformer(self.EMBEDDING_MODEL)
+        return self._embedder.encode([key], normalize_embeddings=True)[0]
+
+    def warmup(self):
+        """Load the embedding model ahead of the first lookup."""
+        if SEMANTIC_CACHE_AVAILABLE:
+            with self._lock:
+                self._embed("warmup")
+
+    def get(self, tech_stack: List[str]) -> Optional[List[str]]:
+        """Return cached questions for this stack or a near-identical one."""
+        key = self.make_key(tech_stack)
+        with self._lock:
+            questions = self._entries.get(key)
+            if questions is not None:
+                self._entries.move_to_end(key)
+                return questions
+            if not (SEMANTIC_CACHE_AVAILABLE and self._vectors):
+                return None
+            
+            import numpy as np
+            keys = list(self._vectors)
+            scores = np.stack([self._vectors[k] for k in keys]) @ self._embed(key)
+            best = int(np.argmax(scores))
+            if scores[best] > self.similarity_threshold:
+                return self._entries[keys[best]]
+            return None
+
+    def put(self, tech_stack: List[str], questions: List[str]):
+        """Store questions for a stack, evicting the oldest set if full."""
+        key = self.make_key(tech_stack)
+        with self._lock:
+            self._entries[key] = questions
+            self._entries.move_to_end(key)
+            if SEMANTIC_CACHE_AVAILABLE:
+                self._vectors[key] = self._embed(key)
+            if len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._vectors.pop(oldest, None)
+
+
+@lru_cache(maxsize=256)
+def _extract_known_techs(text: str) -> Tuple[str, ...]:
+    """Memoized single-pass scan for Config.COMMON_TECHNOLOGIES in text."""
+    return tuple(Config.extract_technologies(text))
+
+
+# Shared across assistant instances (one per Streamlit session)
+_RESPONSE_CACHE = ResponseCache()
+_QUESTION_CACHE = QuestionCache()
+
+# Background LLM calls whose result is only needed on a later turn
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-prefetch")
+
+# Gemini model objects by (model name, system instruction), shared process-wide
+_GEMINI_MODELS: dict = {}
+
+# (provider, model) pairs already warmed up in this process
+_WARMED_UP: set = set()
+_WARMUP_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _http_session() -> requests.Session:
+    """Process-wide keep-alive connection pool for Ollama requests."""
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive"})
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@atexit.register
+def close_http_session():
+    """Close the shared connection pool at process exit (a later call starts a new one)."""
+    if _http_session.cache_info().currsize:
+        _http_session().close()
+        _http_session.cache_clear()
+
 
 class HiringAssistant:
-    """Main class for the Hiring Assistant chatbot with LLM integration."""
+    """
+    Main class for the Hiring Assistant chatbot with LLM integration.
+    
+    LLM policy: only the greeting, fallback, technical question generation,
+    answer evaluation and closing message call the LLM. Info-collection
+    turns (name, contact, experience, position, location) reply with local
+    templates via _template_reply, so they cost no round-trip or tokens.
+    Greeting and fallback replies are cached by request, since neither
+    prompt carries candidate details. Answer evaluation runs in the
+    background after the last answer; call finish_evaluation before saving
+    the candidate.
+    """
+
+    # Input patterns, all compiled once at class creation (exit keywords
+    # live on ConversationManager.EXIT_PATTERN)
+    
+    # One scan finds emails and phones; phone groups are listed in priority order
+    CONTACT_PATTERN = re.compile(
+        r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+        r'|(?P<phone1>\b\d{3}[-.]?\d{3}[-.]?\d{4}\b)'
+        r'|(?P<phone2>\(\d{3}\)\s?\d{3}[-.]?\d{4}\b)'
+        r'|(?P<phone3>(?<![\w+])\+?(?:1\s?)?\d{10}\b)'
+    )
+    PHONE_GROUPS = ("phone1", "phone2", "phone3")
+
+    # Separators for free-form tech stack input (commas, semicolons, whitespace)
+    TECH_SEPARATOR_PATTERN = re.compile(r'[\s,;]+')
+
+    # First integer in an experience answer, and the largest plausible value
+    YEARS_PATTERN = re.compile(r'\d+')
+    MAX_YEARS_OF_EXPERIENCE = 60
+
+    # Ollama bodies are pre-encoded, so the content type is set explicitly
+    JSON_HEADERS = {"Content-Type": "application/json"}
+    
+    # Output budgets (tokens) per kind of turn; generation time scales with them
+    MAX_TOKENS_SHORT = 120
+    MAX_TOKENS_LONG = 500
+    
+    # Stop Ollama before it starts writing the next turn of the flattened prompt
+    OLLAMA_STOP = ("\nuser:", "\nsystem:")
 
     def __init__(self, provider: Optional[str] = None, model: str = "neural-chat"):
         """
@@ -33,7 +276,19 @@ class HiringAssistant:
         """
         self.provider = provider or os.getenv("LLM_PROVIDER", "gemini")
         self.conversation_manager = ConversationManager()
-        self.system_prompt = PromptManager.get_system_prompt()
+        self.system_prompt = _SYSTEM_PROMPT
+        self.greeting = self.DEFAULT_GREETING
+        self._closing_future: Optional[Future] = None
+        self._evaluation_future: Optional[Future] = None
+        self._dispatch = {
+            ConversationState.NAME_COLLECTION: self._handle_name_collection,
+            ConversationState.CONTACT_COLLECTION: self._handle_contact_collection,
+            ConversationState.EXPERIENCE_COLLECTION: self._handle_experience_collection,
+            ConversationState.POSITION_COLLECTION: self._handle_position_collection,
+            ConversationState.LOCATION_COLLECTION: self._handle_location_collection,
+            ConversationState.TECH_STACK_COLLECTION: self._handle_tech_stack_collection,
+            ConversationState.TECHNICAL_QUESTIONS: self._handle_technical_questions,
+        }
         
         if self.provider == "gemini":
             self._init_gemini()
@@ -41,6 +296,14 @@ class HiringAssistant:
             self._init_ollama(model)
         else:
             raise ValueError(f"Unknown provider: {self.provider}")
+        
+        # Page in the model and connection off the first user turn (once per process)
+        with _WARMUP_LOCK:
+            warm_key = (self.provider, self._model_id())
+            needs_warmup = warm_key not in _WARMED_UP
+            _WARMED_UP.add(warm_key)
+        if needs_warmup:
+            threading.Thread(target=self._warmup, name="llm-warmup", daemon=True).start()
 
     def _init_gemini(self):
         """Initialize Google Gemini API."""
@@ -53,12 +316,20 @@ class HiringAssistant:
         
         genai.configure(api_key=api_key)
         self.model_name = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
-        self.gemini_model = genai.GenerativeModel(self.model_name)
+        # Lighter model for simple turns; defaults to the main model
+        self.small_model_name = os.getenv("GEMINI_SMALL_MODEL", self.model_name)
+        self.gemini_model = self._gemini_model_for(self.model_name)
 
     def _init_ollama(self, model: str):
         """Initialize Ollama."""
         self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model = model or os.getenv("OLLAMA_MODEL", "neural-chat")
+        self.small_model = os.getenv("OLLAMA_SMALL_MODEL", self.model)
+        # Keep the model (and its prompt-prefix KV cache) loaded between turns
+        self.ollama_keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        
+        # Reuse one keep-alive connection pool for every Ollama request
+        self._http = _http_session()
         
         if not self._test_ollama_connection():
             raise ValueError(f"Cannot connect to Ollama at {self.base_url}")
@@ -66,74 +337,315 @@ class HiringAssistant:
     def _test_ollama_connection(self) -> bool:
         """Test connection to Ollama server."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = self._http.get(f"{self.base_url}/api/tags", timeout=2)
             return response.status_code == 200
         except:
             return False
 
-    def _call_llm(self, messages: List[dict], temperature: float = 0.7) -> Optional[str]:
+    def _warmup(self):
+        """Issue one tiny generation per client; failures are only logged."""
+        try:
+            if self.provider == "gemini":
+                self.gemini_model.generate_content(
+                    "ok", generation_config=genai.types.GenerationConfig(max_output_tokens=1)
+                )
+            else:
+                # One token on the system prompt loads the model and leaves the
+                # shared prompt prefix in Ollama's cache for the first real turn
+                payload = self._ollama_payload(
+                    [{"role": "system", "content": self.system_prompt}], temperature=0.0, max_tokens=1
+                )
+                self._http.post(
+                    f"{self.base_url}/api/generate",
+                    data=_json_dumps(payload),
+                    headers=self.JSON_HEADERS,
+                    timeout=60
+                )
+        except Exception as e:
+            print(f"Warmup error: {e}")
+        try:
+            _QUESTION_CACHE.warmup()
+        except Exception as e:
+            print(f"Embedding warmup error: {e}")
+
+    def close(self):
+        """
+        Drop this assistant's handle on the HTTP pool.
+        
+        The pool is shared by every session in the process, so it is left
+        open here; close_http_session closes it at process exit.
+        """
+        self._http = None
+
+    def _call_llm(self, messages: List[dict], temperature: float = 0.7,
+                  use_cache: bool = False, model_tier: str = "large",
+                  max_tokens: int = MAX_TOKENS_SHORT) -> Optional[str]:
         """
         Call the LLM API with the given messages.
         
         Args:
             messages: List of message dictionaries
             temperature: Temperature for response generation
+            use_cache: Reuse a previous response for an identical request
+                (only for prompts with no per-candidate content)
+            model_tier: "small" for simple turns, "large" for everything else
+            max_tokens: Upper bound on generated tokens
             
         Returns:
             Generated response or None if error
         """
+        model = self._model_id(model_tier)
+        cache_key = None
+        if use_cache:
+            cache_key = ResponseCache.make_key(self.provider, model, temperature, messages, max_tokens)
+            cached = _RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+        
         if self.provider == "gemini":
-            return self._call_gemini(messages, temperature)
+            response = self._call_gemini(messages, temperature, model, max_tokens)
         else:
-            return self._call_ollama(messages, temperature)
+            response = self._call_ollama(messages, temperature, model, max_tokens)
+        
+        if cache_key and response:
+            _RESPONSE_CACHE.put(cache_key, response)
+        return response
+
+    def _model_id(self, model_tier: str = "large") -> str:
+        """Name of the model for the current provider and tier."""
+        if self.provider == "gemini":
+            return self.small_model_name if model_tier == "small" else self.model_name
+        return self.small_model if model_tier == "small" else self.model
 
-    def _call_gemini(self, messages: List[dict], temperature: float = 0.7) -> Optional[str]:
+    async def a_call_llm(self, messages: List[dict], temperature: float = 0.7,
+                         model_tier: str = "large",
+                         max_tokens: int = MAX_TOKENS_SHORT) -> Optional[str]:
+        """
+        Async variant of _call_llm for event-loop hosts.
+        
+        Gemini uses the client's native async API; the Ollama call runs
+        in a worker thread so it doesn't block the loop.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Temperature for response generation
+            model_tier: "small" for simple turns, "large" for everything else
+            max_tokens: Upper bound on generated tokens
+            
+        Returns:
+            Generated response or None if error
+        """
+        model = self._model_id(model_tier)
+        if self.provider == "gemini":
+            return await self._a_call_gemini(messages, temperature, model, max_tokens)
+        else:
+            return await asyncio.to_thread(self._call_ollama, messages, temperature, model, max_tokens)
+
+    @staticmethod
+    def _format_prompt(messages: List[dict]) -> str:
+        """Flatten chat messages into a single "role: content" prompt."""
+        return "".join(
+            f"{msg.get('role', 'user')}: {msg.get('content', '')}\n" for msg in messages
+        )
+
+    @staticmethod
+    def _to_gemini_contents(messages: List[dict]) -> List[dict]:
+        """
+        Convert chat messages to native Gemini contents.
+        
+        Gemini only knows "user" and "model" roles, so system messages are
+        sent as user parts; consecutive same-role messages are merged into
+        one turn.
+        """
+        contents = []
+        for msg in messages:
+            role = "model" if msg.get("role") == ROLE_ASSISTANT else "user"
+            content = msg.get("content", "")
+            if contents and contents[-1]["role"] == role:
+                contents[-1]["parts"].append(content)
+            else:
+                contents.append({"role": role, "parts": [content]})
+        return contents
+
+    @staticmethod
+    def _split_system(messages: List[dict]) -> Tuple[Optional[str], List[dict]]:
+        """Separate the leading system messages from the rest of the conversation."""
+        count = 0
+        while count < len(messages) and messages[count].get("role") == "system":
+            count += 1
+        if not count:
+            return None, messages
+        system = "\n".join(msg.get("content", "") for msg in messages[:count])
+        return system, messages[count:]
+
+    def _gemini_model_for(self, model_name: str, system: Optional[str] = None):
+        """Get (or create once) the Gemini model for a name and system instruction."""
+        key = (model_name, system)
+        model = _GEMINI_MODELS.get(key)
+        if model is None:
+            if system:
+                model = genai.GenerativeModel(model_name, system_instruction=system)
+            else:
+                model = genai.GenerativeModel(model_name)
+            _GEMINI_MODELS[key] = model
+        return model
+
+    def _prepare_gemini_call(self, messages: List[dict], model_name: Optional[str] = None):
+        """
+        Pick the Gemini model and contents for a call.
+        
+        When the SDK supports system instructions, one model per distinct
+        system prompt is kept so the static prefix is never resent as content.
+        
+        Returns:
+            Tuple of (model, contents)
+        """
+        model_name = model_name or self.model_name
+        if GEMINI_SYSTEM_INSTRUCTION:
+            system, rest = self._split_system(messages)
+            if system and rest:
+                return self._gemini_model_for(model_name, system), self._to_gemini_contents(rest)
+        return self._gemini_model_for(model_name), self._to_gemini_contents(messages)
+
+    @staticmethod
+    def _gemini_generation_config(temperature: float, max_tokens: int):
+        """Build the Gemini generation config for a call."""
+        return genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+
+    def _call_gemini(self, messages: List[dict], temperature: float = 0.7,
+                     model: Optional[str] = None, max_tokens: int = MAX_TOKENS_SHORT) -> Optional[str]:
         """Call Google Gemini API."""
         try:
-            # Format messages for Gemini
-            prompt_text = ""
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                prompt_text += f"{role}: {content}\n"
-            
-            response = self.gemini_model.generate_content(
-                prompt_text,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=temperature,
-                    max_output_tokens=500,
-                )
+            gemini_model, contents = self._prepare_gemini_call(messages, model)
+            response = gemini_model.generate_content(
+                contents,
+                generation_config=self._gemini_generation_config(temperature, max_tokens)
             )
             return response.text.strip() if response.text else None
         except Exception as e:
             print(f"Gemini API Error: {e}")
             return None
 
-    def _call_ollama(self, messages: List[dict], temperature: float = 0.7) -> Optional[str]:
-        """Call Ollama API."""
+    async def _a_call_gemini(self, messages: List[dict], temperature: float = 0.7,
+                             model: Optional[str] = None, max_tokens: int = MAX_TOKENS_SHORT) -> Optional[str]:
+        """Call Google Gemini API asynchronously."""
         try:
-            prompt_text = ""
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                prompt_text += f"{role}: {content}\n"
+            gemini_model, contents = self._prepare_gemini_call(messages, model)
+            response = await gemini_model.generate_content_async(
+                contents,
+                generation_config=self._gemini_generation_config(temperature, max_tokens)
+            )
+            return response.text.strip() if response.text else None
+        except Exception as e:
+            print(f"Gemini API Error: {e}")
+            return None
+
+    def stream_llm(self, messages: List[dict], temperature: float = 0.7,
+                   model_tier: str = "large",
+                   max_tokens: int = MAX_TOKENS_SHORT) -> Iterator[str]:
+        """
+        Stream the LLM response as text chunks for incremental display.
+        
+        Args:
+            messages: List of message dictionaries
+            temperature: Temperature for response generation
+            model_tier: "small" for simple turns, "large" for everything else
+            max_tokens: Upper bound on generated tokens
             
-            prompt_text += "assistant: "
+        Yields:
+            Response text chunks
             
-            response = requests.post(
+        Raises:
+            Exception: If the call fails or the stream ends before the
+                response is complete (chunks already yielded are partial)
+        """
+        model = self._model_id(model_tier)
+        if self.provider == "gemini":
+            yield from self._stream_gemini(messages, temperature, model, max_tokens)
+        else:
+            yield from self._stream_ollama(messages, temperature, model, max_tokens)
+
+    def _stream_gemini(self, messages: List[dict], temperature: float = 0.7,
+                       model: Optional[str] = None, max_tokens: int = MAX_TOKENS_SHORT) -> Iterator[str]:
+        """Stream a Google Gemini response."""
+        try:
+            gemini_model, contents = self._prepare_gemini_call(messages, model)
+            response = gemini_model.generate_content(
+                contents,
+                generation_config=self._gemini_generation_config(temperature, max_tokens),
+                stream=True
+            )
+            for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            print(f"Gemini API Error: {e}")
+            raise
+
+    def _stream_ollama(self, messages: List[dict], temperature: float = 0.7,
+                       model: Optional[str] = None, max_tokens: int = MAX_TOKENS_SHORT) -> Iterator[str]:
+        """Stream an Ollama response (newline-delimited JSON chunks)."""
+        try:
+            with self._http.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt_text,
-                    "temperature": temperature,
-                    "stream": False,
-                    "num_predict": 500
-                },
+                data=_json_dumps(self._ollama_payload(messages, temperature, model, max_tokens, stream=True)),
+                headers=self.JSON_HEADERS,
+                timeout=60,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"HTTP {response.status_code}")
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = _json_loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        return
+                raise ConnectionError("stream ended before the response was done")
+        except Exception as e:
+            print(f"Ollama Error: {e}")
+            raise
+
+    def _ollama_payload(self, messages: List[dict], temperature: float,
+                        model: Optional[str] = None, max_tokens: int = MAX_TOKENS_SHORT,
+                        stream: bool = False) -> dict:
+        """Build the /api/generate request body."""
+        system, rest = self._split_system(messages)
+        payload = {
+            "model": model or self.model,
+            "prompt": self._format_prompt(rest) + "assistant: ",
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+                "stop": list(self.OLLAMA_STOP)
+            },
+            "keep_alive": self.ollama_keep_alive
+        }
+        if system:
+            # Native system field keeps the static prefix identical across
+            # calls so Ollama can reuse its evaluated prompt cache
+            payload["system"] = system
+        return payload
+
+    def _call_ollama(self, messages: List[dict], temperature: float = 0.7,
+                     model: Optional[str] = None, max_tokens: int = MAX_TOKENS_SHORT) -> Optional[str]:
+        """Call Ollama API."""
+        try:
+            response = self._http.post(
+                f"{self.base_url}/api/generate",
+                data=_json_dumps(self._ollama_payload(messages, temperature, model, max_tokens)),
+                headers=self.JSON_HEADERS,
                 timeout=60
             )
             
             if response.status_code == 200:
-                return response.json().get("response", "").strip()
+                return _json_loads(response.content).get("response", "").strip()
             else:
                 print(f"Ollama Error: {response.status_code}")
                 return None
@@ -141,19 +653,100 @@ class HiringAssistant:
             print(f"Ollama Error: {e}")
             return None
 
-    def get_greeting(self) -> str:
-        """Generate greeting message."""
-        messages = [
+    # Greeting used when the LLM is unavailable
+    DEFAULT_GREETING = "Welcome to TalentScout! I'm your AI hiring assistant. Could you please share your full name to get started?"
+
+    # Greeting temperature (also part of the greeting's cache key)
+    GREETING_TEMPERATURE = 0.8
+    GREETING_MAX_TOKENS = MAX_TOKENS_SHORT
+
+    def _greeting_messages(self) -> List[dict]:
+        """Messages for the greeting request."""
+        return [
             {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": PromptManager.get_greeting_prompt()}
+            {"role": "user", "content": _GREETING_PROMPT}
         ]
-        response = self._call_llm(messages, temperature=0.8)
+
+    def _record_greeting(self, response: str):
+        """Store a generated greeting and move on to name collection."""
+        self.greeting = response
+        self.conversation_manager.add_to_history(ROLE_ASSISTANT, response)
+        self.conversation_manager.set_state(ConversationState.NAME_COLLECTION)
+
+    def get_greeting(self) -> str:
+        """Generate greeting message."""
+        # The greeting prompt is static, so any previous greeting can be reused
+        response = self._call_llm(
+            self._greeting_messages(), temperature=self.GREETING_TEMPERATURE,
+            use_cache=True, model_tier="small", max_tokens=self.GREETING_MAX_TOKENS
+        )
         
         if response:
-            self.conversation_manager.add_to_history("assistant", response)
-            self.conversation_manager.set_state(ConversationState.NAME_COLLECTION)
+            self._record_greeting(response)
             return response
-        return "Welcome to TalentScout! I'm your AI hiring assistant. Could you please share your full name to get started?"
+        return self.DEFAULT_GREETING
+
+    def stream_greeting(self) -> Iterator[str]:
+        """
+        Stream the greeting as it is generated (same result as get_greeting).
+        
+        Only a complete response is cached and recorded. If the stream
+        fails, self.greeting is DEFAULT_GREETING; it is yielded only when
+        nothing was streamed, so callers that already showed partial text
+        should redraw with self.greeting.
+        
+        Yields:
+            Text chunks of the greeting
+        """
+        self.greeting = self.DEFAULT_GREETING
+        messages = self._greeting_messages()
+        cache_key = ResponseCache.make_key(
+            self.provider, self._model_id("small"), self.GREETING_TEMPERATURE, messages,
+            self.GREETING_MAX_TOKENS
+        )
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            self._record_greeting(cached)
+            yield cached
+            return
+        
+        chunks = []
+        try:
+            for chunk in self.stream_llm(messages, temperature=self.GREETING_TEMPERATURE,
+                                         model_tier="small", max_tokens=self.GREETING_MAX_TOKENS):
+                chunks.append(chunk)
+                yield chunk
+        except Exception:
+            # Interrupted: the partial text is neither cached nor recorded
+            if not chunks:
+                yield self.DEFAULT_GREETING
+            return
+        
+        response = "".join(chunks).strip()
+        if response:
+            _RESPONSE_CACHE.put(cache_key, response)
+            self._record_greeting(response)
+        else:
+            yield self.DEFAULT_GREETING
+
+    async def a_get_greeting(self) -> str:
+        """Async variant of get_greeting; runs in a worker thread."""
+        return await asyncio.to_thread(self.get_greeting)
+
+    async def a_process_user_input(self, user_input: str) -> Tuple[str, bool]:
+        """
+        Async variant of process_user_input for event-loop hosts.
+        
+        The state machine runs in a worker thread so concurrent sessions
+        on one loop don't block each other on LLM round-trips.
+        
+        Args:
+            user_input: The user's message
+            
+        Returns:
+            Tuple of (response_message, should_exit)
+        """
+        return await asyncio.to_thread(self.process_user_input, user_input)
 
     def process_user_input(self, user_input: str) -> Tuple[str, bool]:
         """
@@ -166,34 +759,20 @@ class HiringAssistant:
             Tuple of (response_message, should_exit)
         """
         if self.conversation_manager.is_exit_intent(user_input):
-            return self._generate_closing_message(), True
+            return self._take_closing_message(), True
 
-        self.conversation_manager.add_to_history("user", user_input)
+        self.conversation_manager.add_to_history(ROLE_USER, user_input)
         current_state = self.conversation_manager.get_current_state()
 
-        if current_state == ConversationState.NAME_COLLECTION:
-            return self._handle_name_collection(user_input)
-        elif current_state == ConversationState.CONTACT_COLLECTION:
-            return self._handle_contact_collection(user_input)
-        elif current_state == ConversationState.EXPERIENCE_COLLECTION:
-            return self._handle_experience_collection(user_input)
-        elif current_state == ConversationState.POSITION_COLLECTION:
-            return self._handle_position_collection(user_input)
-        elif current_state == ConversationState.LOCATION_COLLECTION:
-            return self._handle_location_collection(user_input)
-        elif current_state == ConversationState.TECH_STACK_COLLECTION:
-            return self._handle_tech_stack_collection(user_input)
-        elif current_state == ConversationState.TECHNICAL_QUESTIONS:
-            return self._handle_technical_questions(user_input)
-        else:
-            return self._handle_fallback(user_input)
+        handler = self._dispatch.get(current_state, self._handle_fallback)
+        return handler(user_input)
 
     def _handle_name_collection(self, user_input: str) -> tuple[str, bool]:
         """Handle name collection state."""
         self.conversation_manager.update_candidate_info("full_name", user_input.strip())
         self.conversation_manager.set_state(ConversationState.CONTACT_COLLECTION)
         
-        response = self._generate_response(
+        response = self._template_reply(
             f"Great! I've noted your name as {user_input.strip()}. "
             f"Now, could you please share your email address?"
         )
@@ -202,23 +781,22 @@ class HiringAssistant:
     def _handle_contact_collection(self, user_input: str) -> tuple[str, bool]:
         """Handle contact information collection."""
         candidate = self.conversation_manager.get_candidate_info()
-        emails = self._extract_email(user_input)
-        phones = self._extract_phone(user_input)
+        emails, phones = self._extract_contacts(user_input)
         
         if candidate.email:
             if phones:
                 self.conversation_manager.update_candidate_info("phone", phones[0])
                 self.conversation_manager.set_state(ConversationState.EXPERIENCE_COLLECTION)
-                return self._generate_response(
+                return self._template_reply(
                     f"Perfect! Phone saved: {phones[0]}. How many years of experience do you have?"
                 ), False
             else:
-                return self._generate_response(
+                return self._template_reply(
                     "I couldn't find a valid phone number. Could you provide it in formats like: 123-456-7890 or (123) 456-7890?"
                 ), False
         
         if not emails:
-            return self._generate_response(
+            return self._template_reply(
                 "I couldn't find a valid email address. Could you please provide your email in the format: yourname@example.com?"
             ), False
         
@@ -227,11 +805,11 @@ class HiringAssistant:
         if phones:
             self.conversation_manager.update_candidate_info("phone", phones[0])
             self.conversation_manager.set_state(ConversationState.EXPERIENCE_COLLECTION)
-            response = self._generate_response(
+            response = self._template_reply(
                 f"Thank you! Email: {emails[0]}, Phone: {phones[0]}. How many years of experience do you have?"
             )
         else:
-            response = self._generate_response(
+            response = self._template_reply(
                 f"Got your email: {emails[0]}. Could you also share your phone number?"
             )
         
@@ -239,11 +817,17 @@ class HiringAssistant:
 
     def _handle_experience_collection(self, user_input: str) -> tuple[str, bool]:
         """Handle experience collection."""
-        self.conversation_manager.update_candidate_info("years_of_experience", user_input.strip())
+        years = self._parse_years(user_input)
+        if years is None:
+            return self._template_reply(
+                f"Please tell me your years of experience as a number between 0 and {self.MAX_YEARS_OF_EXPERIENCE}."
+            ), False
+        
+        self.conversation_manager.update_candidate_info("years_of_experience", str(years))
         self.conversation_manager.set_state(ConversationState.POSITION_COLLECTION)
         
-        response = self._generate_response(
-            f"Perfect! {user_input.strip()} years noted. What positions interest you?"
+        response = self._template_reply(
+            f"Perfect! {years} years noted. What positions interest you?"
         )
         return response, False
 
@@ -252,18 +836,22 @@ class HiringAssistant:
         self.conversation_manager.update_candidate_info("desired_positions", user_input.strip())
         self.conversation_manager.set_state(ConversationState.LOCATION_COLLECTION)
         
-        response = self._generate_response(
+        response = self._template_reply(
             f"Great! Interested in: {user_input.strip()}. What's your preferred location?"
         )
         return response, False
 
     def _handle_location_collection(self, user_input: str) -> tuple[str, bool]:
         """Handle location collection."""
-        self.conversation_manager.update_candidate_info("current_location", user_input.strip())
+        location = self._normalize_location(user_input)
+        if not location:
+            return self._template_reply("Could you tell me your preferred location?"), False
+        
+        self.conversation_manager.update_candidate_info("current_location", location)
         self.conversation_manager.set_state(ConversationState.TECH_STACK_COLLECTION)
         
-        response = self._generate_response(
-            f"{user_input.strip()} noted. Tell me about your tech stack."
+        response = self._template_reply(
+            f"{location} noted. Tell me about your tech stack."
         )
         return response, False
 
@@ -277,9 +865,13 @@ class HiringAssistant:
         self.conversation_manager.set_state(ConversationState.TECHNICAL_QUESTIONS)
         
         if questions:
+            # Advance past Q1 so the next answer is stored against it
+            first_question = self.conversation_manager.get_next_question()
+            if not self.conversation_manager.has_more_questions():
+                self._prefetch_closing_message()
             response = (
                 f"Excellent! Tech stack: {', '.join(tech_items)}.\n\n"
-                f"Q1: {questions[0]}"
+                f"Q1: {first_question}"
             )
         else:
             response = "Let me prepare some technical questions for you..."
@@ -291,35 +883,45 @@ class HiringAssistant:
         current_index = self.conversation_manager.current_question_index - 1
         question_num = current_index + 1
         
-        self.conversation_manager.candidate_info.technical_responses[f"question_{question_num}"] = user_input
+        # No question has been asked when question generation came back empty
+        if current_index >= 0:
+            self.conversation_manager.record_technical_answer(user_input)
         
         if self.conversation_manager.has_more_questions():
             next_question = self.conversation_manager.get_next_question()
+            if not self.conversation_manager.has_more_questions():
+                self._prefetch_closing_message()
             response = f"Great answer!\n\nQ{question_num + 1}: {next_question}"
             return response, False
         else:
             self.conversation_manager.set_state(ConversationState.CLOSING)
-            closing_message = self._generate_closing_message()
+            if self._closing_future is None:
+                self._prefetch_closing_message()
+            # Scoring is not needed for the reply; it finishes in the background
+            self._evaluation_future = _PREFETCH_POOL.submit(self._evaluate_technical_answers)
+            closing_message = self._take_closing_message()
             return closing_message, True
 
     def _handle_fallback(self, user_input: str) -> tuple[str, bool]:
         """Handle fallback for unclear input."""
         messages = [
             {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": PromptManager.get_fallback_prompt()},
+            {"role": "user", "content": _FALLBACK_PROMPT},
             {"role": "user", "content": f"User said: {user_input}"}
         ]
-        response = self._call_llm(messages)
+        # Only static prompts plus the input, so identical off-topic input
+        # (in any session) gets the same reply without another call
+        response = self._call_llm(messages, use_cache=True)
         
         if not response:
             response = "Could you rephrase your answer? I'm here to help screen candidates."
         
-        self.conversation_manager.add_to_history("assistant", response)
+        self.conversation_manager.add_to_history(ROLE_ASSISTANT, response)
         return response, False
 
-    def _generate_response(self, message: str) -> str:
-        """Generate a conversational response."""
-        self.conversation_manager.add_to_history("assistant", message)
+    def _template_reply(self, message: str) -> str:
+        """Record a locally templated reply (no LLM call)."""
+        self.conversation_manager.add_to_history(ROLE_ASSISTANT, message)
         return message
 
     def _generate_technical_questions(self, tech_stack: List[str]) -> List[str]:
@@ -327,13 +929,17 @@ class HiringAssistant:
         if not tech_stack:
             return []
         
-        prompt = PromptManager.get_tech_questions_generation_prompt(tech_stack)
+        cached = _QUESTION_CACHE.get(tech_stack)
+        if cached is not None:
+            return list(cached)
+        
+        prompt = get_tech_questions_generation_prompt(tech_stack)
         messages = [
             {"role": "system", "content": "You are an expert technical interviewer."},
             {"role": "user", "content": prompt}
         ]
         
-        response = self._call_llm(messages, temperature=0.5)
+        response = self._call_llm(messages, temperature=0.5, max_tokens=self.MAX_TOKENS_LONG)
         if not response:
             return ["Tell me about a challenging project you've worked on."]
         
@@ -343,7 +949,75 @@ class HiringAssistant:
             if line and len(line) > 10:
                 questions.append(line)
         
-        return questions[:5]
+        questions = questions[:5]
+        if questions:
+            _QUESTION_CACHE.put(tech_stack, questions)
+        return list(questions)
+
+    def _evaluate_technical_answers(self):
+        """Score all technical answers with one LLM call and store the result."""
+        qa_pairs = self.conversation_manager.get_technical_qa_pairs()
+        if not qa_pairs:
+            return
+        
+        messages = [
+            {"role": "system", "content": "You are an expert technical interviewer."},
+            {"role": "user", "content": get_answer_evaluation_prompt(qa_pairs)}
+        ]
+        response = self._call_llm(messages, temperature=0.2, max_tokens=self.MAX_TOKENS_LONG)
+        evaluation = self._parse_evaluation(response, len(qa_pairs))
+        if evaluation:
+            candidate = self.conversation_manager.get_candidate_info()
+            candidate.technical_scores, candidate.technical_summary = evaluation
+
+    def finish_evaluation(self):
+        """Wait for the background answer evaluation, if any, so candidate info is final."""
+        future, self._evaluation_future = self._evaluation_future, None
+        if future is None:
+            return
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Answer evaluation error: {e}")
+
+    @staticmethod
+    def _parse_evaluation(response: Optional[str], expected: int) -> Optional[Tuple[List[int], str]]:
+        """
+        Parse the evaluation JSON returned by the LLM.
+        
+        Args:
+            response: Raw LLM response (may be wrapped in a code fence)
+            expected: Number of answers that were scored
+            
+        Returns:
+            Tuple of (scores, summary) or None if the response is unusable
+        """
+        if not response:
+            return None
+        start, end = response.find("{"), response.rfind("}")
+        if start == -1 or end < start:
+            return None
+        try:
+            data = json.loads(response[start:end + 1])
+            scores = [max(0, min(10, int(score))) for score in data["scores"]][:expected]
+            return scores, str(data.get("summary", "")).strip()
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _prefetch_closing_message(self):
+        """Start generating the closing message while the last answer is pending."""
+        self._closing_future = _PREFETCH_POOL.submit(self._generate_closing_message)
+
+    def _take_closing_message(self) -> str:
+        """Return the prefetched closing message, generating it now if none is pending."""
+        future, self._closing_future = self._closing_future, None
+        if future is None:
+            return self._generate_closing_message()
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Closing prefetch error: {e}")
+            return self._generate_closing_message()
 
     def _generate_closing_message(self) -> str:
         """Generate closing message."""
@@ -351,9 +1025,9 @@ class HiringAssistant:
         if candidate.full_name:
             messages = [
                 {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": PromptManager.get_closing_prompt(candidate.full_name)}
+                {"role": "user", "content": get_closing_prompt(candidate.full_name)}
             ]
-            response = self._call_llm(messages, temperature=0.7)
+            response = self._call_llm(messages, temperature=0.7, max_tokens=self.MAX_TOKENS_LONG)
             if response:
                 return response
         
@@ -362,46 +1036,42 @@ class HiringAssistant:
             "We'll be in touch within 2-3 business days. Have a great day!"
         )
 
-    def _extract_email(self, text: str) -> List[str]:
-        """Extract email addresses from text."""
-        import re
-        pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        return re.findall(pattern, text)
-
-    def _extract_phone(self, text: str) -> List[str]:
-        """Extract phone numbers from text."""
-        import re
-        patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-            r'\b\(\d{3}\)\s?\d{3}[-.]?\d{4}\b',
-            r'\b\+?1?\s?\d{10}\b'
-        ]
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches
-        return []
+    @classmethod
+    def _parse_years(cls, text: str) -> Optional[int]:
+        """Return the first integer in text if it is a plausible number of years."""
+        match = cls.YEARS_PATTERN.search(text)
+        if not match:
+            return None
+        years = int(match.group(0))
+        return years if years <= cls.MAX_YEARS_OF_EXPERIENCE else None
 
-    def _parse_tech_stack(self, text: str) -> List[str]:
-        """Parse tech stack from user input."""
-        common_techs = [
-            'Python', 'JavaScript', 'TypeScript', 'Java', 'C++', 'C#', 'Go', 'Rust', 'PHP', 'Ruby',
-            'React', 'Vue', 'Angular', 'Node.js', 'Django', 'Flask', 'FastAPI', 'Spring', 'Express',
-            'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Cassandra', 'Firebase',
-            'AWS', 'GCP', 'Azure', 'Docker', 'Kubernetes', 'Linux', 'Git',
-            'HTML', 'CSS', 'SQL', 'GraphQL', 'REST', 'API'
-        ]
+    @staticmethod
+    def _normalize_location(text: str) -> str:
+        """Collapse whitespace and capitalize lowercase words (acronyms like NYC are kept)."""
+        return " ".join(w.capitalize() if w.islower() else w for w in text.split())
+
+    def _extract_contacts(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        Extract email addresses and phone numbers in a single pass.
         
-        found_techs = []
-        text_lower = text.lower()
+        Phones are returned from the first format that matched at all,
+        so a plain 123-456-7890 wins over the looser formats.
         
-        for tech in common_techs:
-            if tech.lower() in text_lower:
-                found_techs.append(tech)
+        Returns:
+            Tuple of (emails, phones)
+        """
+        found = {"email": [], "phone1": [], "phone2": [], "phone3": []}
+        for match in self.CONTACT_PATTERN.finditer(text):
+            found[match.lastgroup].append(match.group())
+        phones = next((found[group] for group in self.PHONE_GROUPS if found[group]), [])
+        return found["email"], phones
+
+    def _parse_tech_stack(self, text: str) -> List[str]:
+        """Parse tech stack from user input."""
+        found_techs = list(_extract_known_techs(text))
         
         if not found_techs:
-            items = [item.strip() for item in text.replace(',', ' ').replace(';', ' ').split()]
-            found_techs = [item for item in items if len(item) > 2]
+            found_techs = [item for item in self.TECH_SEPARATOR_PATTERN.split(text) if len(item) > 2]
         
         return found_techs if found_techs else ['General Web Development']
 
@@ -410,6 +1080,7 @@ if __name__ == "__main__":
     try:
         assistant = HiringAssistant()
         print("Hiring Assistant initialized successfully!")
+        print(asyncio.run(assistant.a_get_greeting()))
     except Exception as e:
         print(f"Error: {e}")
         print("Please ensure you have configured either Gemini API key or Ollama properly")
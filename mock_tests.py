@@ -8,6 +8,7 @@ from utils.data_handler import DataHandler
 import tempfile
 import shutil
 import json
+import sys
 
 
 class MockTestRunner:
@@ -18,6 +19,17 @@ class MockTestRunner:
         self.passed = 0
         self.failed = 0
         self.test_dir = tempfile.mkdtemp()
+        self._output = []
+    
+    def _write(self, line: str):
+        """Buffer a report line; the report is written once in flush()."""
+        self._output.append(line)
+    
+    def flush(self):
+        """Write the buffered report to stdout in one call."""
+        if self._output:
+            sys.stdout.write("\n".join(self._output) + "\n")
+            self._output.clear()
     
     def cleanup(self):
         """Clean up test artifacts."""
@@ -25,33 +37,33 @@ class MockTestRunner:
     
     def test_section(self, name: str):
         """Print test section header."""
-        print(f"\n{'='*50}")
-        print(f"  {name}")
-        print(f"{'='*50}")
+        self._write(f"\n{'='*50}")
+        self._write(f"  {name}")
+        self._write(f"{'='*50}")
     
     def assert_true(self, condition: bool, message: str):
         """Assert condition is true."""
         if condition:
-            print(f"✓ {message}")
+            self._write(f"✓ {message}")
             self.passed += 1
         else:
-            print(f"✗ {message}")
+            self._write(f"✗ {message}")
             self.failed += 1
     
     def assert_equal(self, actual, expected, message: str):
         """Assert values are equal."""
         if actual == expected:
-            print(f"✓ {message}")
+            self._write(f"✓ {message}")
             self.passed += 1
         else:
-            print(f"✗ {message} (got {actual}, expected {expected})")
+            self._write(f"✗ {message} (got {actual}, expected {expected})")
             self.failed += 1
     
     def run_all_tests(self):
         """Run all mock tests."""
-        print("\n" + "="*50)
-        print("  TalentScout Application - Mock Test Suite")
-        print("="*50)
+        self._write("\n" + "="*50)
+        self._write("  TalentScout Application - Mock Test Suite")
+        self._write("="*50)
         
         self.test_conversation_manager()
         self.test_prompt_manager()
@@ -61,15 +73,15 @@ class MockTestRunner:
         self.test_exit_intent()
         self.test_tech_stack_parsing()
         
-        print("\n" + "="*50)
-        print(f"  Test Results: {self.passed} passed, {self.failed} failed")
-        print("="*50)
+        self._write("\n" + "="*50)
+        self._write(f"  Test Results: {self.passed} passed, {self.failed} failed")
+        self._write("="*50)
         
         if self.failed == 0:
-            print("\n✓ All tests passed! Application logic is working correctly.")
+            self._write("\n✓ All tests passed! Application logic is working correctly.")
             return True
         else:
-            print(f"\n✗ {self.failed} test(s) failed.")
+            self._write(f"\n✗ {self.failed} test(s) failed.")
             return False
     
     def test_conversation_manager(self):
@@ -193,6 +205,8 @@ class MockTestRunner:
             id1 != id2 and id1.startswith("CAND_"),
             "Anonymous IDs are unique and properly formatted"
         )
+        
+        handler.close()
     
     def test_conversation_flow(self):
         """Test complete conversation flow."""
@@ -336,6 +350,7 @@ def main():
     
     try:
         success = runner.run_all_tests()
+        runner.flush()
         runner.cleanup()
         
         if success:
@@ -349,11 +364,11 @@ def main():
             print("="*50)
             return 1
     except Exception as e:
+        runner.flush()
         print(f"\n✗ Error running tests: {e}")
         runner.cleanup()
         return 1
 
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())
@@ -8,7 +8,7 @@ echo "=========================================="
 
 # Check if Python is installed
 if ! command -v python3 &> /dev/null; then
-    echo "Python 3 is not installed. Please install Python 3.8 or higher."
+    echo "Python 3 is not installed. Please install Python 3.10 or higher."
     exit 1
 fi
 
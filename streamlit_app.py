@@ -5,8 +5,8 @@ Minimalistic design with clean interface.
 
 import streamlit as st
 import os
-from main import HiringAssistant
-from utils.data_handler import DataHandler
+import time
+from collections import deque
 
 # Page configuration
 st.set_page_config(
@@ -16,13 +16,12 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Minimalistic CSS with Tailwind-inspired design and animations
-st.markdown("""
+# Minimalistic CSS with Tailwind-inspired design; only the static header,
+# end message and footer animate, chat messages do not
+_CSS = """
     <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
     * {
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Inter, sans-serif;
     }
     
     html, body, [data-testid="stAppViewContainer"] {
@@ -64,11 +63,6 @@ st.markdown("""
         to { opacity: 1; }
     }
     
-    @keyframes pulse {
-        0%, 100% { opacity: 1; }
-        50% { opacity: 0.5; }
-    }
-    
     .header {
         text-align: center;
         margin-bottom: 3rem;
@@ -76,7 +70,6 @@ st.markdown("""
         background: linear-gradient(135deg, rgba(30, 41, 82, 0.8), rgba(15, 23, 42, 0.8));
         border-radius: 1rem;
         border: 1px solid rgba(148, 163, 184, 0.1);
-        backdrop-filter: blur(10px);
         animation: fadeInDown 0.6s ease-out;
         box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
     }
@@ -85,32 +78,13 @@ st.markdown("""
         margin: 0;
         font-size: 2.2rem;
         font-weight: 700;
-        background: linear-gradient(135deg, #60a5fa, #34d399);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        animation: slideInUp 0.7s ease-out;
+        color: #60a5fa;
     }
     
     .header p {
         margin: 0.75rem 0 0 0;
         font-size: 1rem;
         color: #94a3b8;
-        animation: slideInUp 0.8s ease-out;
-    }
-    
-    /* Chat Container */
-    .chat-container {
-        min-height: 350px;
-        margin-bottom: 2rem;
-        padding: 1.5rem;
-        background: rgba(15, 23, 42, 0.6);
-        border-radius: 1rem;
-        border: 1px solid rgba(148, 163, 184, 0.1);
-        backdrop-filter: blur(10px);
-        animation: fadeIn 0.8s ease-out;
-        overflow-y: auto;
-        max-height: 500px;
     }
     
     /* Chat Messages */
@@ -118,8 +92,6 @@ st.markdown("""
         padding: 1rem;
         margin-bottom: 1rem;
         border-radius: 0.75rem;
-        animation: slideInUp 0.4s ease-out;
-        transition: all 0.3s ease;
     }
     
     .stChatMessage[data-testid="stChatMessageContent"] {
@@ -147,7 +119,6 @@ st.markdown("""
         border-top: 1px solid rgba(148, 163, 184, 0.1);
         padding-top: 1.5rem;
         margin-top: 1.5rem;
-        animation: slideInUp 0.6s ease-out;
     }
     
     input[type="text"] {
@@ -180,7 +151,6 @@ st.markdown("""
         color: #86efac;
         font-size: 1rem;
         animation: slideInUp 0.6s ease-out;
-        backdrop-filter: blur(10px);
     }
     
     .end-message p {
@@ -211,16 +181,6 @@ st.markdown("""
         margin: 1.5rem 0;
     }
     
-    /* Loading Animation */
-    @keyframes shimmer {
-        0% { background-position: -1000px 0; }
-        100% { background-position: 1000px 0; }
-    }
-    
-    .loading {
-        animation: pulse 2s cubic-bezier(0.4, 0, 0.6, 1) infinite;
-    }
-    
     /* Scrollbar Styling */
     ::-webkit-scrollbar {
         width: 8px;
@@ -263,72 +223,156 @@ st.markdown("""
         transform: translateY(0);
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div class="header">
+    <h1>💼 TalentScout</h1>
+    <p>AI-Powered Hiring Assistant</p>
+</div>
+"""
+
+_END_HTML = """
+<div class="end-message">
+    <p>✨ Interview Complete</p>
+    <p>Thank you for your time!</p>
+    <p style="font-size: 0.85rem; color: #64748b; margin-top: 0.75rem;">Your information has been saved and will be reviewed.</p>
+</div>
+"""
+
+_FOOTER_HTML = """
+<div class="footer">
+    TalentScout © 2024 • AI-Powered Recruitment
+</div>
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
 
-# Initialize session state
-if "assistant" not in st.session_state:
+
+# Number of trailing messages rendered as individual chat bubbles
+LIVE_MESSAGES = 2
+
+# Messages kept on screen; older ones are archived and shown on request
+MAX_DISPLAY_MESSAGES = 64
+
+AVATARS = {"user": "👤", "assistant": "🤖"}
+
+
+@st.cache_resource
+def get_data_handler():
+    """One DataHandler for the whole server; it holds no per-session state."""
+    from utils.data_handler import DataHandler
+    return DataHandler()
+
+
+def init_session():
+    """
+    Create the per-session assistant on first run.
+    
+    The assistant keeps per-session conversation state; its HTTP pool,
+    Gemini models and caches are shared process-wide. main (and the LLM
+    client behind it) is imported here so the header paints first.
+    """
+    if "assistant" in st.session_state:
+        return
+    from main import HiringAssistant
     try:
         st.session_state.assistant = HiringAssistant()
         st.session_state.conversation_started = False
-        st.session_state.chat_history = []
+        st.session_state.chat_history = deque(maxlen=MAX_DISPLAY_MESSAGES)
+        st.session_state.archived_history = []
         st.session_state.should_exit = False
-        st.session_state.data_handler = DataHandler()
+        st.session_state.data_handler = get_data_handler()
     except ValueError as e:
         st.error(f"❌ {str(e)}")
         st.info("Make sure Ollama is running at http://localhost:11434")
         st.stop()
 
 
+class StreamBuffer:
+    """Accumulate streamed text and redraw a placeholder at a bounded rate."""
+    
+    MIN_FLUSH_SECONDS = 0.05
+    
+    def __init__(self, placeholder):
+        self.placeholder = placeholder
+        self.parts = []
+        self._last_flush = 0.0
+    
+    def add(self, chunk: str):
+        """Add a chunk, redrawing only if the last redraw is old enough."""
+        self.parts.append(chunk)
+        if time.monotonic() - self._last_flush >= self.MIN_FLUSH_SECONDS:
+            self.flush()
+    
+    def flush(self) -> str:
+        """Redraw with everything received so far and return the text."""
+        text = "".join(self.parts)
+        self.placeholder.markdown(text)
+        self._last_flush = time.monotonic()
+        return text
+
+
+def add_message(role: str, content: str):
+    """Append a message to the display history, archiving the oldest when full."""
+    history = st.session_state.chat_history
+    if len(history) == history.maxlen:
+        st.session_state.archived_history.append(history[0])
+    history.append({"role": role, "content": content})
+
+
+def render_messages_block(messages):
+    """Render messages as a single markdown element."""
+    st.markdown("\n\n---\n\n".join(
+        f"{AVATARS[m['role']]} {m['content']}" for m in messages
+    ))
+
+
 def display_chat_history():
-    """Display chat history in the UI."""
-    for i, message_dict in enumerate(st.session_state.chat_history):
-        if message_dict["role"] == "user":
-            with st.chat_message("user", avatar="👤"):
-                st.write(message_dict["content"])
-        else:
-            with st.chat_message("assistant", avatar="🤖"):
-                st.write(message_dict["content"])
+    """Display chat history in the UI.
+    
+    Earlier turns are rendered as one markdown block so a rerun parses a
+    single element for them; only the latest exchange gets chat bubbles.
+    """
+    archived = st.session_state.archived_history
+    if archived and st.toggle("Show earlier messages", key="show_archived"):
+        render_messages_block(archived)
+    
+    history = list(st.session_state.chat_history)
+    earlier, live = history[:-LIVE_MESSAGES], history[-LIVE_MESSAGES:]
+    if earlier:
+        render_messages_block(earlier)
+    for message_dict in live:
+        role = message_dict["role"]
+        with st.chat_message(role, avatar=AVATARS[role]):
+            st.write(message_dict["content"])
 
 
 def main():
     """Main Streamlit application."""
     
     # Header
-    st.markdown("""
-        <div class="header">
-            <h1>💼 TalentScout</h1>
-            <p>AI-Powered Hiring Assistant</p>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    # Get initial greeting if conversation hasn't started
-    if not st.session_state.conversation_started:
-        greeting = st.session_state.assistant.get_greeting()
-        st.session_state.chat_history.append({
-            "role": "assistant",
-            "content": greeting
-        })
-        st.session_state.conversation_started = True
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+    init_session()
     
     # Display chat history
-    st.markdown('<div class="chat-container">', unsafe_allow_html=True)
     display_chat_history()
-    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Stream the initial greeting if conversation hasn't started
+    if not st.session_state.conversation_started:
+        with st.chat_message("assistant", avatar=AVATARS["assistant"]):
+            buffer = StreamBuffer(st.empty())
+            for chunk in st.session_state.assistant.stream_greeting():
+                buffer.add(chunk)
+            # The final greeting; differs from the streamed text if it broke off
+            greeting = st.session_state.assistant.greeting
+            buffer.placeholder.markdown(greeting)
+        add_message("assistant", greeting)
+        st.session_state.conversation_started = True
     
     # Check if conversation should end
     if st.session_state.should_exit:
-        st.markdown("""
-            <div class="end-message">
-                <p>✨ Interview Complete</p>
-                <p>Thank you for your time!</p>
-                <p style="font-size: 0.85rem; color: #64748b; margin-top: 0.75rem;">Your information has been saved and will be reviewed.</p>
-            </div>
-        """, unsafe_allow_html=True)
-        st.markdown("""
-            <div class="footer">
-                TalentScout © 2024 • AI-Powered Recruitment
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_END_HTML + _FOOTER_HTML, unsafe_allow_html=True)
         return
     
     # Chat input
@@ -338,35 +382,29 @@ def main():
     )
     
     if user_input:
-        # Add user message to history
-        st.session_state.chat_history.append({
-            "role": "user",
-            "content": user_input
-        })
+        # Show the new turn directly instead of rerunning the whole script
+        add_message("user", user_input)
+        with st.chat_message("user", avatar=AVATARS["user"]):
+            st.write(user_input)
         
         # Process input with assistant
         response, should_exit = st.session_state.assistant.process_user_input(user_input)
         
-        # Add assistant response to history
-        st.session_state.chat_history.append({
-            "role": "assistant",
-            "content": response
-        })
+        add_message("assistant", response)
+        with st.chat_message("assistant", avatar=AVATARS["assistant"]):
+            st.write(response)
         
         # Save candidate info if conversation is ending
         if should_exit:
+            # The reply is already shown; wait for the answer scores before saving
+            st.session_state.assistant.finish_evaluation()
             candidate_info = st.session_state.assistant.conversation_manager.get_candidate_info()
             st.session_state.data_handler.save_candidate_info(candidate_info)
             st.session_state.should_exit = True
-        
-        # Rerun to update the UI
-        st.rerun()
-    
-    st.markdown("""
-        <div class="footer">
-            TalentScout © 2024 • AI-Powered Recruitment
-        </div>
-    """, unsafe_allow_html=True)
+            # Rerun once so the input is replaced by the end message
+            st.rerun()
+    
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
@@ -7,10 +7,16 @@ import unittest
 from unittest.mock import patch, MagicMock
 from core import ConversationManager, PromptManager, ConversationState, CandidateInfo
 from utils.data_handler import DataHandler
+from config import Config
+from main import HiringAssistant, ResponseCache, QuestionCache, _http_session, close_http_session
 import tempfile
 import shutil
 import os
 import json
+import csv
+import io
+import threading
+from datetime import datetime
 
 
 class TestConversationManager(unittest.TestCase):
@@ -32,6 +38,7 @@ class TestConversationManager(unittest.TestCase):
         self.assertTrue(self.manager.is_exit_intent("GOODBYE"))
         self.assertTrue(self.manager.is_exit_intent("I want to quit"))
         self.assertFalse(self.manager.is_exit_intent("next question"))
+        self.assertFalse(self.manager.is_exit_intent("maybe this weekend"))
     
     def test_conversation_history(self):
         """Test conversation history tracking."""
@@ -39,7 +46,26 @@ class TestConversationManager(unittest.TestCase):
         self.manager.add_to_history("assistant", "Hi there")
         
         self.assertEqual(len(self.manager.conversation_history), 2)
-        self.assertEqual(self.manager.conversation_history[0]["role"], "user")
+        self.assertEqual(self.manager.conversation_history[0], ("user", "Hello"))
+    
+    def test_conversation_history_bounded(self):
+        """Test conversation history evicts oldest messages."""
+        for i in range(ConversationManager.MAX_HISTORY + 5):
+            self.manager.add_to_history("user", f"msg {i}")
+        
+        self.assertEqual(len(self.manager.conversation_history), ConversationManager.MAX_HISTORY)
+        context = self.manager.get_conversation_context()
+        self.assertIn(f"msg {ConversationManager.MAX_HISTORY + 4}", context)
+        self.assertNotIn("msg 0\n", context)
+    
+    def test_windowed_history_keeps_first_message(self):
+        """Test the windowed history keeps the opening message as a prefix."""
+        for i in range(12):
+            self.manager.add_to_history("user", f"msg {i}")
+        
+        window = self.manager.windowed_history(k=3)
+        self.assertEqual([content for _, content in window], ["msg 0", "msg 9", "msg 10", "msg 11"])
+        self.assertEqual(len(ConversationManager().windowed_history()), 0)
     
     def test_state_transitions(self):
         """Test state transitions."""
@@ -51,6 +77,14 @@ class TestConversationManager(unittest.TestCase):
         self.manager.update_candidate_info("full_name", "John Doe")
         self.assertEqual(self.manager.candidate_info.full_name, "John Doe")
     
+    def test_tech_stack_normalized(self):
+        """Test tech stack updates keep a normalized set alongside the list."""
+        self.manager.update_candidate_info("tech_stack", ["Python", " python", "Django"])
+        self.assertEqual(self.manager.candidate_info.tech_stack, ["Python", " python", "Django"])
+        self.assertEqual(self.manager.candidate_info.tech_stack_normalized, frozenset({"python", "django"}))
+        # Also derived for directly constructed candidates
+        self.assertEqual(CandidateInfo(tech_stack=["Go", "GO "]).tech_stack_normalized, frozenset({"go"}))
+    
     def test_technical_questions_management(self):
         """Test technical questions management."""
         questions = ["Q1", "Q2", "Q3"]
@@ -59,6 +93,19 @@ class TestConversationManager(unittest.TestCase):
         self.assertTrue(self.manager.has_more_questions())
         q1 = self.manager.get_next_question()
         self.assertEqual(q1, "Q1")
+    
+    def test_technical_qa_pairs(self):
+        """Test answers are paired with questions in order."""
+        self.manager.set_technical_questions(["Q1", "Q2", "Q3"])
+        for answer in ("A1", "A2"):
+            self.manager.get_next_question()
+            self.manager.record_technical_answer(answer)
+        
+        self.assertEqual(self.manager.get_technical_qa_pairs(), [("Q1", "A1"), ("Q2", "A2")])
+        
+        # A second answer to the same question would shift later pairs
+        with self.assertRaises(ValueError):
+            self.manager.record_technical_answer("A2 again")
 
 
 class TestPromptManager(unittest.TestCase):
@@ -93,6 +140,28 @@ class TestPromptManager(unittest.TestCase):
         self.assertIn("PostgreSQL", prompt)
 
 
+class TestConfig(unittest.TestCase):
+    """Test cases for Config helpers."""
+    
+    def test_is_known_tech(self):
+        """Test case-insensitive technology lookup."""
+        self.assertTrue(Config.is_known_tech("python"))
+        self.assertTrue(Config.is_known_tech(" PostgreSQL "))
+        self.assertFalse(Config.is_known_tech("Cobol"))
+    
+    def test_extract_technologies(self):
+        """Test technologies are extracted once each, in mention order."""
+        techs = Config.extract_technologies("I use django, JavaScript, C++ and MySQL; Django mostly")
+        self.assertEqual(techs, ["Django", "JavaScript", "C++", "MySQL"])
+    
+    def test_common_words_are_not_technologies(self):
+        """Test everyday words only count as technologies with their listed spelling."""
+        self.assertEqual(Config.extract_technologies("I'd like to go with the rest of the team"), [])
+        self.assertEqual(Config.extract_technologies("We ship an express service in spring"), [])
+        self.assertEqual(Config.extract_technologies("python, r and go"), ["Python"])
+        self.assertEqual(Config.extract_technologies("Go, R and REST APIs"), ["Go", "R", "REST"])
+
+
 class TestCandidateInfo(unittest.TestCase):
     """Test cases for CandidateInfo."""
     
@@ -118,14 +187,21 @@ class TestCandidateInfo(unittest.TestCase):
 class TestDataHandler(unittest.TestCase):
     """Test cases for DataHandler."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary root shared by the tests in this class."""
+        cls.test_root = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared root (and the activity log written next to the data)."""
+        shutil.rmtree(cls.test_root)
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = os.path.join(self.test_root, self._testMethodName, "candidate_info")
         self.handler = DataHandler(data_dir=self.test_dir)
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.test_dir)
+        self.addCleanup(self.handler.close)
     
     def test_candidate_save_and_retrieve(self):
         """Test saving and retrieving candidate information."""
@@ -145,6 +221,130 @@ class TestDataHandler(unittest.TestCase):
         candidates = self.handler.get_all_candidates()
         self.assertGreater(len(candidates), 0)
     
+    def test_bulk_save(self):
+        """Test saving several candidates in one batch."""
+        candidates = [CandidateInfo(full_name=f"User {i}", email=f"u{i}@example.com") for i in range(3)]
+        
+        self.assertEqual(self.handler.save_candidate_info_bulk(candidates), 3)
+        self.assertEqual(len(self.handler.get_all_candidates()), 3)
+    
+    def test_close_stops_background_threads(self):
+        """Test close writes pending entries and stops the handler's threads."""
+        self.handler.save_candidate_info(CandidateInfo(full_name="Closing"))
+        self.handler.close()
+        self.assertFalse(self.handler._log_thread.is_alive())
+        with open(os.path.join(os.path.dirname(self.test_dir), "activity_log.jsonl")) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.handler.close()
+    
+    def test_activity_log_appends_lines(self):
+        """Test each activity is appended as one JSON line."""
+        self.handler.save_candidate_info(CandidateInfo(full_name="Log User"))
+        self.handler.save_candidate_info(CandidateInfo(full_name="Log User 2"))
+        self.handler.flush_logs()
+        
+        log_file = os.path.join(os.path.dirname(self.test_dir), "activity_log.jsonl")
+        with open(log_file) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([e["activity"] for e in entries], ["CANDIDATE_SAVED", "CANDIDATE_SAVED"])
+        self.assertLessEqual(*(datetime.fromisoformat(e["timestamp"]) for e in entries))
+    
+    def test_compressed_and_plain_records(self):
+        """Test gzip and plain JSON records are both listed and retrievable."""
+        self.handler.save_candidate_info(CandidateInfo(full_name="Zipped"))
+        with patch.object(DataHandler, "STORE_COMPRESSED", False):
+            self.handler.save_candidate_info(CandidateInfo(full_name="Plain"))
+        
+        records = list(self.handler._record_files())
+        self.assertEqual(sorted(os.path.splitext(f)[1] for f in records), [".gz", ".json"])
+        self.assertTrue(all(os.path.dirname(f) != self.test_dir for f in records))
+        for summary in self.handler.get_all_candidates():
+            self.assertIsNotNone(self.handler.retrieve_candidate_info(summary["anonymous_id"]))
+    
+    def test_index_tracks_saves_deletes_and_cleanup(self):
+        """Test listings come from the index and survive a missing index."""
+        self.handler.save_candidate_info_bulk([CandidateInfo(full_name=n) for n in ("A", "B", "C")])
+        ids = [c["anonymous_id"] for c in self.handler.get_all_candidates()]
+        self.assertEqual(len(ids), 3)
+        
+        self.handler.delete_candidate_info(ids[0])
+        self.assertEqual([c["anonymous_id"] for c in self.handler.get_all_candidates()], ids[1:])
+        
+        # A handler on a directory without an index rebuilds it from the
+        # records, including unsharded ones from older versions
+        os.remove(os.path.join(self.test_dir, DataHandler.INDEX_FILE))
+        legacy = self.handler._record_path(ids[1])
+        os.replace(legacy, os.path.join(self.test_dir, os.path.basename(legacy)))
+        handler = DataHandler(data_dir=self.test_dir)
+        self.addCleanup(handler.close)
+        self.assertEqual(sorted(c["anonymous_id"] for c in handler.get_all_candidates()), ids[1:])
+        
+        self.assertEqual(handler.cleanup_old_data(days=-1), 2)
+        self.assertEqual(handler.get_all_candidates(), [])
+    
+    def test_index_rebuild_skips_corrupt_records(self):
+        """Test a corrupt record does not stop the handler from starting."""
+        self.handler.save_candidate_info(CandidateInfo(full_name="Good"))
+        with open(os.path.join(self.test_dir, "CAND_broken.json"), "w") as f:
+            f.write('{"anonymous_id": "CAND_br')
+        os.remove(os.path.join(self.test_dir, DataHandler.INDEX_FILE))
+        
+        with patch("builtins.print"):
+            handler = DataHandler(data_dir=self.test_dir)
+        self.addCleanup(handler.close)
+        self.assertEqual(len(handler.get_all_candidates()), 1)
+    
+    def test_torn_index_line_is_recovered(self):
+        """Test a half-written index line does not break listing or cleanup."""
+        self.handler.save_candidate_info(CandidateInfo(full_name="Before"))
+        with open(os.path.join(self.test_dir, DataHandler.INDEX_FILE), "ab") as f:
+            f.write(b'{"id":"CAND_torn","ts":"20')
+        self.handler.save_candidate_info(CandidateInfo(full_name="After"))
+        
+        with patch("builtins.print"):
+            self.assertEqual(len(self.handler.get_all_candidates()), 2)
+        self.assertEqual(self.handler.cleanup_old_data(days=-1), 2)
+        self.assertEqual(self.handler.get_all_candidates(), [])
+    
+    def test_cleanup_keeps_concurrent_saves(self):
+        """Test a save made while cleanup runs stays in the compacted index."""
+        self.handler.save_candidate_info(CandidateInfo(full_name="Old"))
+        saver = threading.Thread(target=self.handler.save_candidate_info,
+                                 args=(CandidateInfo(full_name="New"),))
+        record_path = self.handler._record_path
+        
+        def record_path_during_save(anon_id):
+            saver.start()
+            saver.join(0.2)
+            return record_path(anon_id)
+        
+        with patch.object(self.handler, "_record_path", record_path_during_save):
+            self.assertEqual(self.handler.cleanup_old_data(days=-1), 1)
+        saver.join()
+        self.assertEqual(len(self.handler.get_all_candidates()), 1)
+    
+    def test_grouped_fsync(self):
+        """Test durable mode defers fsyncs to one grouped sync."""
+        handler = DataHandler(data_dir=self.test_dir, fsync_interval=3600)
+        self.addCleanup(handler.close)
+        with patch.dict(os.environ, {"DATA_FSYNC_INTERVAL": "2.5"}):
+            from_env = DataHandler(data_dir=self.test_dir)
+        self.addCleanup(from_env.close)
+        self.assertEqual(from_env.fsync_interval, 2.5)
+        self.assertFalse(self.handler.fsync_interval)
+        
+        with patch("utils.data_handler.os.fsync") as fsync:
+            handler.save_candidate_info_bulk([CandidateInfo(full_name=n) for n in ("A", "B")])
+            fsync.assert_not_called()
+            
+            handler.sync()
+            # Two records, their shard directories, the index and data_dir
+            self.assertGreaterEqual(fsync.call_count, 4)
+            
+            fsync.reset_mock()
+            handler.sync()
+            fsync.assert_not_called()
+    
     def test_anonymization(self):
         """Test data anonymization."""
         candidate = CandidateInfo(
@@ -174,12 +374,209 @@ class TestDataHandler(unittest.TestCase):
             tech_stack=["Python"]
         )
         self.handler.save_candidate_info(candidate)
+        with patch.object(DataHandler, "STORE_COMPRESSED", False):
+            self.handler.save_candidate_info(candidate)
         
         # Export as JSON
         exported = self.handler.export_data(export_format="json")
         self.assertIsNotNone(exported)
         data = json.loads(exported)
         self.assertIsInstance(data, list)
+        self.assertEqual(len(data), 2)
+    
+    def test_csv_quoting(self):
+        """Test CSV export quotes commas and joins list values."""
+        self.handler.save_candidate_info(CandidateInfo(
+            full_name="Csv User", desired_positions="Backend, Platform", tech_stack=["Python", "Go"]
+        ))
+        
+        rows = list(csv.DictReader(io.StringIO(self.handler.export_data(export_format="csv"))))
+        self.assertEqual(rows[0]["desired_positions"], "Backend, Platform")
+        self.assertEqual(rows[0]["tech_stack"], "Python;Go")
+    
+    def test_export_to_file(self):
+        """Test streaming exports in NDJSON and JSON array form."""
+        for name in ("One", "Two"):
+            self.handler.save_candidate_info(CandidateInfo(full_name=name))
+        
+        ndjson_path = os.path.join(self.test_root, "export.ndjson")
+        self.assertEqual(self.handler.export_to_file(ndjson_path), 2)
+        with open(ndjson_path) as f:
+            self.assertEqual(len([json.loads(line) for line in f]), 2)
+        
+        json_path = os.path.join(self.test_root, "export.json")
+        self.handler.export_to_file(json_path, export_format="json")
+        with open(json_path) as f:
+            self.assertEqual(len(json.load(f)), 2)
+        
+        # A failed export reports -1 and leaves the previous file in place
+        with patch.object(DataHandler, "_read_record_bytes", side_effect=OSError("disk error")), \
+                patch("builtins.print"):
+            self.assertEqual(self.handler.export_to_file(json_path, export_format="json"), -1)
+        with open(json_path) as f:
+            self.assertEqual(len(json.load(f)), 2)
+        self.assertFalse(os.path.exists(json_path + ".tmp"))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the LLM response cache."""
+    
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+        
+        self.assertEqual(cache.get("a"), "A")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "C")
+    
+    def test_key_depends_on_request(self):
+        """Test cache keys differ when any request part differs."""
+        messages = [{"role": "user", "content": "Hi"}]
+        key = ResponseCache.make_key("gemini", "m", 0.8, messages)
+        self.assertEqual(key, ResponseCache.make_key("gemini", "m", 0.8, list(messages)))
+        self.assertNotEqual(key, ResponseCache.make_key("gemini", "m", 0.5, messages))
+
+
+class TestAnswerEvaluation(unittest.TestCase):
+    """Test cases for batched technical answer evaluation."""
+    
+    def test_evaluation_prompt_includes_all_answers(self):
+        """Test every question/answer pair goes into one prompt."""
+        prompt = PromptManager.get_answer_evaluation_prompt([("Q one", "A one"), ("Q two", "A two")])
+        for text in ("Q1: Q one", "A1: A one", "Q2: Q two", "A2: A two"):
+            self.assertIn(text, prompt)
+    
+    def test_parse_evaluation(self):
+        """Test evaluation JSON parsing, clamping and error handling."""
+        response = '```json\n{"scores": [7, 12, 3], "summary": " Solid basics. "}\n```'
+        self.assertEqual(HiringAssistant._parse_evaluation(response, 2), ([7, 10], "Solid basics."))
+        self.assertIsNone(HiringAssistant._parse_evaluation("not json", 2))
+        self.assertIsNone(HiringAssistant._parse_evaluation(None, 2))
+
+
+class TestInputNormalization(unittest.TestCase):
+    """Test cases for local parsing of candidate answers."""
+    
+    def test_parse_years(self):
+        """Test years are extracted and implausible values rejected."""
+        self.assertEqual(HiringAssistant._parse_years("About 7 years"), 7)
+        self.assertEqual(HiringAssistant._parse_years("0"), 0)
+        self.assertIsNone(HiringAssistant._parse_years("a few"))
+        self.assertIsNone(HiringAssistant._parse_years("100 years"))
+    
+    def test_normalize_location(self):
+        """Test locations are title-cased without mangling acronyms."""
+        self.assertEqual(HiringAssistant._normalize_location("  new   york "), "New York")
+        self.assertEqual(HiringAssistant._normalize_location("NYC"), "NYC")
+    
+    def test_extract_contacts(self):
+        """Test emails and phones are found in one pass."""
+        assistant = HiringAssistant.__new__(HiringAssistant)
+        emails, phones = assistant._extract_contacts("jane@example.com, (123) 456-7890")
+        self.assertEqual(emails, ["jane@example.com"])
+        self.assertEqual(phones, ["(123) 456-7890"])
+        self.assertEqual(assistant._extract_contacts("call 123-456-7890"), ([], ["123-456-7890"]))
+        # Bare ten-digit numbers match without the preceding whitespace
+        self.assertEqual(assistant._extract_contacts("call 5551234567"), ([], ["5551234567"]))
+        self.assertEqual(assistant._extract_contacts("jane@x.com 5551234567"), (["jane@x.com"], ["5551234567"]))
+        self.assertEqual(assistant._extract_contacts("email 5551234567@sms.com"), (["5551234567@sms.com"], []))
+        self.assertEqual(assistant._extract_contacts("+1 5551234567"), ([], ["+1 5551234567"]))
+
+
+class TestClosingPrefetch(unittest.TestCase):
+    """Test cases for the prefetched closing message."""
+    
+    def test_prefetched_closing_is_used_once(self):
+        """Test the prefetched message is consumed and later calls regenerate."""
+        assistant = HiringAssistant.__new__(HiringAssistant)
+        assistant._closing_future = None
+        calls = []
+        assistant._generate_closing_message = lambda: calls.append(1) or f"Bye #{len(calls)}"
+        
+        assistant._prefetch_closing_message()
+        self.assertEqual(assistant._take_closing_message(), "Bye #1")
+        self.assertIsNone(assistant._closing_future)
+        self.assertEqual(assistant._take_closing_message(), "Bye #2")
+    
+    def test_final_answer_does_not_wait_for_evaluation(self):
+        """Test the closing reply is returned while scoring is still running."""
+        assistant = HiringAssistant.__new__(HiringAssistant)
+        assistant._closing_future = assistant._evaluation_future = None
+        assistant.conversation_manager = ConversationManager()
+        assistant.conversation_manager.set_technical_questions(["Q1"])
+        assistant.conversation_manager.get_next_question()
+        assistant._generate_closing_message = lambda: "Bye"
+        
+        scoring = threading.Event()
+        def evaluate():
+            scoring.wait(5)
+            assistant.conversation_manager.candidate_info.technical_scores = [4]
+        assistant._evaluate_technical_answers = evaluate
+        
+        self.assertEqual(assistant._handle_technical_questions("An answer"), ("Bye", True))
+        self.assertEqual(assistant.conversation_manager.candidate_info.technical_scores, [])
+        scoring.set()
+        assistant.finish_evaluation()
+        self.assertEqual(assistant.conversation_manager.candidate_info.technical_scores, [4])
+
+
+class TestHttpSession(unittest.TestCase):
+    """Test cases for the shared HTTP connection pool."""
+    
+    def test_assistant_close_keeps_shared_pool(self):
+        """Test one assistant closing leaves the pool open for the others."""
+        assistant = HiringAssistant.__new__(HiringAssistant)
+        assistant._http = session = _http_session()
+        
+        with patch.object(session, "close") as close:
+            assistant.close()
+            close.assert_not_called()
+            self.assertIs(_http_session(), session)
+            
+            close_http_session()
+            close.assert_called_once()
+        self.assertIsNot(_http_session(), session)
+
+
+class TestGreetingStream(unittest.TestCase):
+    """Test cases for the streamed greeting."""
+    
+    def test_interrupted_stream_is_not_cached(self):
+        """Test a stream that breaks off falls back to the default greeting."""
+        assistant = HiringAssistant.__new__(HiringAssistant)
+        assistant.provider, assistant.small_model = "ollama", "test-interrupted-greeting"
+        assistant.system_prompt = "system"
+        assistant.conversation_manager = ConversationManager()
+        
+        def broken_stream(*args, **kwargs):
+            yield "Welcome to Tal"
+            raise ConnectionError("stream ended before the response was done")
+        
+        with patch.object(HiringAssistant, "stream_llm", broken_stream):
+            self.assertEqual(list(assistant.stream_greeting()), ["Welcome to Tal"])
+            self.assertEqual(assistant.greeting, HiringAssistant.DEFAULT_GREETING)
+            self.assertEqual(len(assistant.conversation_manager.conversation_history), 0)
+        
+        with patch.object(HiringAssistant, "stream_llm", lambda *a, **k: iter(["Hi", " there"])):
+            self.assertEqual(list(assistant.stream_greeting()), ["Hi", " there"])
+        self.assertEqual(assistant.greeting, "Hi there")
+
+
+class TestQuestionCache(unittest.TestCase):
+    """Test cases for the technical question cache."""
+    
+    @patch("main.SEMANTIC_CACHE_AVAILABLE", False)
+    def test_normalized_stack_hits(self):
+        """Test stacks differing only in order/case share cached questions."""
+        cache = QuestionCache()
+        cache.put(["Python", "Django"], ["Q1", "Q2"])
+        
+        self.assertEqual(cache.get(["django", " PYTHON"]), ["Q1", "Q2"])
+        self.assertIsNone(cache.get(["Python", "Flask"]))
 
 
 class TestConversationFlow(unittest.TestCase):
@@ -212,19 +609,51 @@ class TestConversationFlow(unittest.TestCase):
         self.manager.update_candidate_info("tech_stack", ["Python", "Django"])
         
         self.assertTrue(self.manager.is_info_complete())
+    
+    def test_answers_are_scored_against_their_questions(self):
+        """Test a full interview pairs each answer with the question it answered."""
+        with patch.object(HiringAssistant, "_test_ollama_connection", return_value=True), \
+                patch.object(HiringAssistant, "_warmup"):
+            assistant = HiringAssistant(provider="ollama")
+        assistant.conversation_manager.set_state(ConversationState.NAME_COLLECTION)
+        assistant._generate_technical_questions = lambda tech_stack: ["Q1", "Q2", "Q3"]
+        assistant._generate_closing_message = lambda: "Bye"
+        evaluated = []
+        assistant._evaluate_technical_answers = lambda: evaluated.append(
+            assistant.conversation_manager.get_technical_qa_pairs()
+        )
+        
+        replies = [assistant.process_user_input(text)[0] for text in (
+            "Alice Smith", "alice@example.com 555-123-4567", "5", "Backend Developer",
+            "Berlin", "Python, Django", "A1", "A2"
+        )]
+        self.assertTrue(replies[-3].endswith("Q1: Q1"))
+        self.assertTrue(replies[-2].endswith("Q2: Q2"))
+        self.assertTrue(replies[-1].endswith("Q3: Q3"))
+        self.assertEqual(assistant.process_user_input("A3"), ("Bye", True))
+        
+        assistant.finish_evaluation()
+        self.assertEqual(evaluated, [[("Q1", "A1"), ("Q2", "A2"), ("Q3", "A3")]])
 
 
 class TestDataPrivacy(unittest.TestCase):
     """Test cases for data privacy and GDPR compliance."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary root shared by the tests in this class."""
+        cls.test_root = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared root (and the activity log written next to the data)."""
+        shutil.rmtree(cls.test_root)
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = os.path.join(self.test_root, self._testMethodName, "candidate_info")
         self.handler = DataHandler(data_dir=self.test_dir)
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.test_dir)
+        self.addCleanup(self.handler.close)
     
     def test_pii_hashing(self):
         """Test PII hashing for privacy."""
@@ -238,6 +667,12 @@ class TestDataPrivacy(unittest.TestCase):
         # Different input should produce different hash
         hashed3 = self.handler._hash_pii("jane@example.com")
         self.assertNotEqual(hashed1, hashed3)
+        
+        # Batched hashing matches per-value hashing
+        self.assertEqual(
+            self.handler._hash_pii_many([pii, None, "jane@example.com"]),
+            [hashed1, None, hashed3]
+        )
     
     def test_deletion_gdpr_right_to_be_forgotten(self):
         """Test GDPR right to be forgotten."""
@@ -3,15 +3,42 @@ Data handler for TalentScout Hiring Assistant.
 Manages secure storage, anonymization, and GDPR compliance for candidate information.
 """
 
+import atexit
+import csv
+import gzip
+import io
 import json
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict
+from itertools import chain
+from typing import Optional, Dict, Iterable, BinaryIO, TextIO, Union
 import hashlib
+import itertools
 import secrets
 from core import CandidateInfo
 
+# Faster JSON for record and log files when orjson is installed; both
+# variants produce compact UTF-8 bytes (or 2-space indented with indent=True)
+try:
+    import orjson
+
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, indent=2).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    _json_loads = json.loads
+
 
 class DataHandler:
     """
@@ -19,18 +46,85 @@ class DataHandler:
     Implements GDPR compliance and data privacy best practices.
     """
 
-    def __init__(self, data_dir: str = "data/candidate_info"):
+    # Activity log writer: entries are queued and written in batches by a
+    # background thread, at most LOG_BATCH_SIZE per write
+    LOG_BATCH_SIZE = 64
+    LOG_FLUSH_INTERVAL = 0.1
+
+    # Buffer size for record file writes
+    WRITE_BUFFER_SIZE = 64 * 1024
+
+    # Threads used to read all records at once (file reads release the GIL)
+    READ_WORKERS = 16
+
+    # New records are written gzip-compressed (level 1: cheap on CPU);
+    # plain .json records are still read
+    STORE_COMPRESSED = True
+    RECORD_SUFFIXES = (".json.gz", ".json")
+
+    # Append-only index of stored records ({"id", "ts", "tech"} per line,
+    # {"id", "deleted"} tombstones) so listings don't open every record
+    INDEX_FILE = "index.jsonl"
+
+    # Records are spread over 256 subdirectories ("00".."ff") by a one-byte
+    # hash of the ID; records from before sharding stay in data_dir
+    SHARD_DIGEST_SIZE = 1
+
+    def __init__(self, data_dir: str = "data/candidate_info",
+                 fsync_interval: Optional[float] = None):
         """
         Initialize the data handler.
         
+        Durability: by default records and the index are left to the OS page
+        cache, so a power loss can drop the last few seconds of saves. With
+        an fsync interval, everything written since the last pass is fsynced
+        together by a background thread every fsync_interval seconds (group
+        commit): a crash loses at most that window, at the cost of one batch
+        of fsyncs per interval rather than one per save.
+        
         Args:
             data_dir: Directory for storing candidate information
+            fsync_interval: Seconds between grouped fsyncs; defaults to the
+                DATA_FSYNC_INTERVAL environment variable (0 or unset: off)
         """
+        if fsync_interval is None:
+            fsync_interval = float(os.getenv("DATA_FSYNC_INTERVAL") or 0)
+        self.fsync_interval = fsync_interval
+        
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._shards_created = set()
         
         # Encryption salt (in production, use environment variable)
         self.salt = os.getenv("DATA_SALT", "salt_2024_talentscout").encode()
+        
+        # Anonymous IDs: one timestamp and random seed per handler, then a counter
+        self._id_prefix = f"CAND_{datetime.now():%Y%m%d%H%M%S}_{secrets.token_hex(4)}"
+        self._id_counter = itertools.count()
+        
+        # The activity log sits next to data_dir, which already exists
+        self._log_path = self.data_dir.parent / "activity_log.jsonl"
+        self._log_queue = queue.Queue()
+        self._log_thread = threading.Thread(target=self._log_drainer, name="activity-log", daemon=True)
+        self._log_thread.start()
+        atexit.register(self.flush_logs)
+        self._closed = threading.Event()
+        
+        self._index_path = self.data_dir / self.INDEX_FILE
+        self._index_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._unsynced_records = set()
+        self._index_unsynced = False
+        if not self._index_path.exists():
+            # Records written before the index existed; unreadable ones are skipped
+            with self._index_lock:
+                self._write_index(map(self._index_entry, self._read_all_records(skip_unreadable=True)))
+        
+        self._sync_thread = None
+        if self.fsync_interval:
+            self._sync_thread = threading.Thread(target=self._syncer, name="fsync", daemon=True)
+            self._sync_thread.start()
+            atexit.register(self.sync)
 
     def save_candidate_info(self, candidate: CandidateInfo) -> bool:
         """
@@ -43,21 +137,9 @@ class DataHandler:
             True if successful, False otherwise
         """
         try:
-            # Generate anonymized ID
-            anon_id = self._generate_anonymous_id(candidate.email or candidate.full_name)
-            
-            # Create candidate data with metadata
-            candidate_data = {
-                "anonymous_id": anon_id,
-                "timestamp": datetime.now().isoformat(),
-                "data": self._anonymize_data(candidate),
-                "version": "1.0"
-            }
-            
-            # Save to file
-            filename = self.data_dir / f"{anon_id}.json"
-            with open(filename, 'w') as f:
-                json.dump(candidate_data, f, indent=2)
+            entry = self._write_record(candidate)
+            self._append_index([entry])
+            anon_id = entry["id"]
             
             # Create log entry
             self._log_activity("CANDIDATE_SAVED", anon_id, "Candidate information saved securely")
@@ -68,6 +150,203 @@ class DataHandler:
             self._log_activity("SAVE_ERROR", "", str(e))
             return False
 
+    def save_candidate_info_bulk(self, candidates: Iterable[CandidateInfo]) -> int:
+        """
+        Save many candidates, writing a single audit log entry for the batch.
+        
+        Args:
+            candidates: CandidateInfo objects to save
+            
+        Returns:
+            Number of candidates saved
+        """
+        entries = []
+        for candidate in candidates:
+            try:
+                entries.append(self._write_record(candidate))
+            except Exception as e:
+                print(f"Error saving candidate information: {e}")
+                self._log_activity("SAVE_ERROR", "", str(e))
+        
+        if entries:
+            self._append_index(entries)
+            saved = [entry["id"] for entry in entries]
+            self._log_activity("CANDIDATES_SAVED", ",".join(saved),
+                               f"{len(saved)} candidate records saved securely")
+        return len(entries)
+
+    def _write_record(self, candidate: CandidateInfo) -> Dict:
+        """
+        Anonymize a candidate and write its record file.
+        
+        The caller appends the returned entry to the index once the
+        record is on disk.
+        
+        Args:
+            candidate: CandidateInfo object to save
+            
+        Returns:
+            Index entry of the saved record
+        """
+        # Generate anonymized ID
+        anon_id = self._generate_anonymous_id(candidate.email or candidate.full_name)
+        
+        # Create candidate data with metadata
+        candidate_data = {
+            "anonymous_id": anon_id,
+            "timestamp": datetime.now().isoformat(),
+            "data": self._anonymize_data(candidate),
+            "version": "1.0"
+        }
+        
+        # Save to file: compact JSON, encoded once and written in one call
+        payload = _json_dumps(candidate_data)
+        shard_dir = self._shard_dir(anon_id, create=True)
+        if self.STORE_COMPRESSED:
+            path = shard_dir / f"{anon_id}.json.gz"
+            with gzip.open(path, 'wb', compresslevel=1) as f:
+                f.write(payload)
+        else:
+            path = shard_dir / f"{anon_id}.json"
+            with open(path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+                f.write(payload)
+        if self.fsync_interval:
+            with self._sync_lock:
+                self._unsynced_records.add(path)
+        return self._index_entry(candidate_data)
+
+    @staticmethod
+    def _index_entry(record: Dict) -> Dict:
+        """Index entry for a stored record."""
+        return {
+            "id": record.get("anonymous_id"),
+            "ts": record.get("timestamp"),
+            "tech": record.get("data", {}).get("tech_stack", [])
+        }
+
+    def _append_index(self, entries: list):
+        """Append entries (or tombstones) to the index in one write."""
+        with self._index_lock, open(self._index_path, 'ab') as f:
+            f.writelines(_json_dumps(entry) + b"\n" for entry in entries)
+            self._index_unsynced = True
+
+    def _write_index(self, entries: Iterable[Dict]):
+        """Replace the index with the given entries (caller holds _index_lock)."""
+        tmp_path = self._index_path.with_suffix(".tmp")
+        with open(tmp_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+            f.writelines(_json_dumps(entry) + b"\n" for entry in entries)
+        os.replace(tmp_path, self._index_path)
+        self._index_unsynced = True
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """
+        Live index entries by anonymous ID (caller holds _index_lock).
+        
+        If any line cannot be parsed (e.g. an append torn by a crash), the
+        index is rebuilt from the record files, since the damaged line may
+        have been the only entry for a saved record.
+        
+        Returns:
+            Dictionary of index entries, in save order
+        """
+        index = {}
+        unreadable = 0
+        with open(self._index_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = _json_loads(line)
+                except ValueError:
+                    unreadable += 1
+                    continue
+                if entry.get("deleted"):
+                    index.pop(entry["id"], None)
+                else:
+                    index[entry["id"]] = entry
+        
+        if unreadable:
+            details = f"{unreadable} unreadable index lines; rebuilt from record files"
+            print(f"Candidate index: {details}")
+            self._log_activity("INDEX_REBUILT", "", details)
+            entries = list(map(self._index_entry, self._read_all_records(skip_unreadable=True)))
+            self._write_index(entries)
+            index = {entry["id"]: entry for entry in entries}
+        return index
+
+    def _shard_dir(self, anonymous_id: str, create: bool = False) -> Path:
+        """Shard subdirectory for an ID, created on first use when create is set."""
+        shard = hashlib.blake2b(anonymous_id.encode(), digest_size=self.SHARD_DIGEST_SIZE).hexdigest()
+        path = self.data_dir / shard
+        if create and shard not in self._shards_created:
+            path.mkdir(exist_ok=True)
+            self._shards_created.add(shard)
+        return path
+
+    def _record_path(self, anonymous_id: str) -> Optional[Path]:
+        """Path of the stored record for an ID (compressed or plain), or None."""
+        for directory in (self._shard_dir(anonymous_id), self.data_dir):
+            for suffix in self.RECORD_SUFFIXES:
+                path = directory / f"{anonymous_id}{suffix}"
+                if path.exists():
+                    return path
+        return None
+
+    def _record_files(self):
+        """Iterate over the paths (str) of every stored record file, shards included."""
+        suffixes = self.RECORD_SUFFIXES
+        shard_name_length = 2 * self.SHARD_DIGEST_SIZE
+        with os.scandir(self.data_dir) as it:
+            entries = list(it)
+        for entry in entries:
+            if entry.name.endswith(suffixes) and entry.is_file():
+                yield entry.path
+            elif len(entry.name) == shard_name_length and entry.is_dir():
+                with os.scandir(entry.path) as shard:
+                    for record in shard:
+                        if record.name.endswith(suffixes) and record.is_file():
+                            yield record.path
+
+    @staticmethod
+    def _read_record_bytes(path: Union[str, Path]) -> bytes:
+        """Raw JSON bytes of a record file, decompressing .gz records."""
+        opener = gzip.open if os.fspath(path).endswith(".gz") else open
+        with opener(path, 'rb') as f:
+            return f.read()
+
+    @classmethod
+    def _read_record(cls, path: Union[str, Path]) -> Dict:
+        """Load a record file."""
+        return _json_loads(cls._read_record_bytes(path))
+
+    def _read_all_records(self, raw: bool = False, skip_unreadable: bool = False) -> list:
+        """
+        Load every record, reading files concurrently.
+        
+        Args:
+            raw: Return the raw JSON bytes instead of parsed records
+            skip_unreadable: Log and leave out corrupt or truncated records
+                instead of raising
+            
+        Returns:
+            List of records
+        """
+        reader = self._read_record_bytes if raw else self._read_record
+        if skip_unreadable:
+            reader = self._skipping_errors(reader)
+        with ThreadPoolExecutor(max_workers=self.READ_WORKERS) as pool:
+            records = list(pool.map(reader, self._record_files()))
+        return [record for record in records if record is not None] if skip_unreadable else records
+
+    def _skipping_errors(self, reader):
+        """Wrap a record reader so failures are logged and return None."""
+        def read(path):
+            try:
+                return reader(path)
+            except Exception as e:
+                print(f"Error reading candidate record {path}: {e}")
+                self._log_activity("READ_ERROR", os.path.basename(path), str(e))
+                return None
+        return read
+
     def retrieve_candidate_info(self, anonymous_id: str) -> Optional[Dict]:
         """
         Retrieve candidate information by anonymous ID.
@@ -79,12 +358,11 @@ class DataHandler:
             Dictionary with candidate info or None if not found
         """
         try:
-            filename = self.data_dir / f"{anonymous_id}.json"
-            if not filename.exists():
+            filename = self._record_path(anonymous_id)
+            if filename is None:
                 return None
             
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            data = self._read_record(filename)
             
             self._log_activity("CANDIDATE_RETRIEVED", anonymous_id, "Candidate information retrieved")
             return data
@@ -103,9 +381,10 @@ class DataHandler:
             True if successful, False otherwise
         """
         try:
-            filename = self.data_dir / f"{anonymous_id}.json"
-            if filename.exists():
+            filename = self._record_path(anonymous_id)
+            if filename is not None:
                 filename.unlink()
+                self._append_index([{"id": anonymous_id, "deleted": True}])
                 self._log_activity("CANDIDATE_DELETED", anonymous_id, "Candidate information deleted per GDPR request")
                 return True
             return False
@@ -118,20 +397,18 @@ class DataHandler:
         """
         Get list of all stored candidates (anonymized).
         
+        Summaries come from the index; record files are not opened.
+        
         Returns:
             List of candidate summaries
         """
         try:
-            candidates = []
-            for file in self.data_dir.glob("*.json"):
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                candidates.append({
-                    "anonymous_id": data.get("anonymous_id"),
-                    "timestamp": data.get("timestamp"),
-                    "tech_stack": data.get("data", {}).get("tech_stack", [])
-                })
-            return candidates
+            with self._index_lock:
+                index = self._load_index()
+            return [
+                {"anonymous_id": entry["id"], "timestamp": entry["ts"], "tech_stack": entry["tech"]}
+                for entry in index.values()
+            ]
         except Exception as e:
             print(f"Error retrieving candidates: {e}")
             return []
@@ -140,6 +417,9 @@ class DataHandler:
         """
         Export all data in specified format (GDPR data portability).
         
+        For JSON the stored records are pasted into one array as they are,
+        without being parsed and re-encoded.
+        
         Args:
             export_format: Format for export ("json" or "csv")
             
@@ -147,21 +427,79 @@ class DataHandler:
             Exported data as string
         """
         try:
-            candidates = []
-            for file in self.data_dir.glob("*.json"):
-                with open(file, 'r') as f:
-                    candidates.append(json.load(f))
+            if export_format == "csv":
+                return self._convert_to_csv(self._read_all_records())
             
-            if export_format == "json":
-                return json.dumps(candidates, indent=2)
-            elif export_format == "csv":
-                return self._convert_to_csv(candidates)
-            else:
-                return json.dumps(candidates, indent=2)
+            records = self._read_all_records(raw=True)
+            return (b"[" + b",".join(record.strip() for record in records) + b"]").decode('utf-8')
         except Exception as e:
             print(f"Error exporting data: {e}")
             return ""
 
+    def export_to_file(self, out_path: str, export_format: str = "ndjson") -> int:
+        """
+        Stream all records to a file without holding the dataset in memory.
+        
+        Records are copied as stored (no decode/re-encode) for "ndjson" and
+        "json"; "csv" is written row by row. The export is written to a
+        temporary file and renamed into place, so a failed export never
+        leaves a partial out_path behind.
+        
+        Args:
+            out_path: Destination file
+            export_format: "ndjson", "json" (one array) or "csv"
+            
+        Returns:
+            Number of records exported, or -1 if the export failed
+        """
+        tmp_path = f"{out_path}.tmp"
+        try:
+            if export_format == "csv":
+                with open(tmp_path, 'w', encoding='utf-8', newline='',
+                          buffering=self.WRITE_BUFFER_SIZE) as out:
+                    records = (self._read_record(file) for file in self._record_files())
+                    count = self._write_csv(records, out)
+            else:
+                with open(tmp_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as out:
+                    count = self._write_json_records(out, as_array=export_format == "json")
+            os.replace(tmp_path, out_path)
+            return count
+        except Exception as e:
+            print(f"Error exporting data: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return -1
+
+    def _write_json_records(self, out: BinaryIO, as_array: bool) -> int:
+        """
+        Copy stored records to a binary stream as NDJSON or one JSON array.
+        
+        Args:
+            out: Binary stream
+            as_array: Write a JSON array instead of one record per line
+            
+        Returns:
+            Number of records written
+        """
+        count = 0
+        if as_array:
+            out.write(b"[")
+        for file in self._record_files():
+            raw = self._read_record_bytes(file).strip()
+            if b"\n" in raw:
+                # Older pretty-printed records; compact them to one line
+                raw = _json_dumps(_json_loads(raw))
+            if as_array:
+                out.write(b"," + raw if count else raw)
+            else:
+                out.write(raw + b"\n")
+            count += 1
+        if as_array:
+            out.write(b"]")
+        return count
+
     def _anonymize_data(self, candidate: CandidateInfo) -> Dict:
         """
         Anonymize sensitive candidate information.
@@ -172,15 +510,20 @@ class DataHandler:
         Returns:
             Dictionary with anonymized data
         """
+        full_name, email, phone = self._hash_pii_many(
+            (candidate.full_name, candidate.email, candidate.phone)
+        )
         return {
-            "full_name": self._hash_pii(candidate.full_name) if candidate.full_name else None,
-            "email": self._hash_pii(candidate.email) if candidate.email else None,
-            "phone": self._hash_pii(candidate.phone) if candidate.phone else None,
+            "full_name": full_name,
+            "email": email,
+            "phone": phone,
             "years_of_experience": candidate.years_of_experience,
             "desired_positions": candidate.desired_positions,
             "current_location": candidate.current_location,
             "tech_stack": candidate.tech_stack,
-            "technical_responses_count": len(candidate.technical_responses)
+            "technical_responses_count": len(candidate.technical_responses),
+            "technical_scores": candidate.technical_scores,
+            "technical_summary": candidate.technical_summary
         }
 
     def _hash_pii(self, data: str) -> str:
@@ -193,52 +536,158 @@ class DataHandler:
         Returns:
             Hashed data
         """
-        return hashlib.sha256(data.encode() + self.salt).hexdigest()[:16]
+        return hashlib.sha256(data.encode() + self.salt).digest()[:8].hex()
+
+    def _hash_pii_many(self, values) -> list:
+        """
+        Hash several PII values in one pass (same digests as _hash_pii).
+        
+        Args:
+            values: Iterable of values; empty values map to None
+            
+        Returns:
+            List of hashed values
+        """
+        sha256, salt = hashlib.sha256, self.salt
+        return [
+            sha256(value.encode() + salt).digest()[:8].hex() if value else None
+            for value in values
+        ]
 
     def _generate_anonymous_id(self, identifier: str) -> str:
         """
         Generate an anonymous ID from an identifier.
         
+        IDs share the handler's random prefix and differ by a counter, so
+        no clock read or urandom call is made per save.
+        
         Args:
             identifier: Identifier (email, name, etc.)
             
         Returns:
             Anonymous ID
         """
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        random_suffix = secrets.token_hex(4)
-        return f"CAND_{timestamp}_{random_suffix}"
+        return f"{self._id_prefix}_{next(self._id_counter):06x}"
 
     def _log_activity(self, activity: str, candidate_id: str, details: str):
         """
         Log data access and modification activities for audit trail.
+        Only a raw time.time() stamp is taken here; the background log
+        thread builds and formats the entry.
         
         Args:
             activity: Type of activity
             candidate_id: Candidate ID (can be anonymous)
             details: Activity details
         """
+        self._log_queue.put((time.time(), activity, candidate_id, details))
+
+    def flush_logs(self):
+        """Block until every queued activity log entry has been written."""
+        self._log_queue.join()
+
+    def close(self):
+        """
+        Write pending log entries (and fsyncs), then stop the background threads.
+        
+        The handler must not be used afterwards; closing again does nothing.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        
+        # None tells the log thread to stop once everything before it is written
+        self._log_queue.put(None)
+        self._log_thread.join()
+        atexit.unregister(self.flush_logs)
+        
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+            self.sync()
+            atexit.unregister(self.sync)
+
+    def sync(self):
+        """
+        fsync everything written since the last sync: record files and their
+        directories first, then the index, so the index never lists a record
+        that is not on disk.
+        """
+        with self._sync_lock:
+            records, self._unsynced_records = self._unsynced_records, set()
+        with self._index_lock:
+            index_unsynced, self._index_unsynced = self._index_unsynced, False
+        
         try:
-            log_file = self.data_dir / ".." / "activity_log.json"
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "activity": activity,
-                "candidate_id": candidate_id,
-                "details": details
-            }
-            
-            # Append to log file
-            logs = []
-            if log_file.exists():
-                with open(log_file, 'r') as f:
-                    logs = json.load(f)
-            
-            logs.append(log_entry)
+            for path in records:
+                self._fsync_path(path)
+            for directory in {path.parent for path in records}:
+                self._fsync_path(directory)
+            if index_unsynced:
+                self._fsync_path(self._index_path)
+                self._fsync_path(self.data_dir)
+        except Exception as e:
+            print(f"Error syncing candidate data: {e}")
+
+    @staticmethod
+    def _fsync_path(path: Path):
+        """fsync a file or directory; missing files and unsupported directories are skipped."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except (FileNotFoundError, PermissionError, IsADirectoryError):
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _syncer(self):
+        """Background loop: one grouped sync per fsync_interval."""
+        while not self._closed.wait(self.fsync_interval):
+            if self._unsynced_records or self._index_unsynced:
+                self.sync()
+
+    def _log_drainer(self):
+        """Background loop: coalesce queued entries and append them in one write."""
+        stopping = False
+        while not stopping:
+            batch = [self._log_queue.get()]
+            deadline = time.monotonic() + self.LOG_FLUSH_INTERVAL
+            while batch[-1] is not None and len(batch) < self.LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
             
-            with open(log_file, 'w') as f:
-                json.dump(logs, f, indent=2)
+            # None is the stop marker queued by close()
+            stopping = batch[-1] is None
+            entries = batch[:-1] if stopping else batch
+            if entries:
+                self._write_log_batch(entries)
+            for _ in batch:
+                self._log_queue.task_done()
+
+    def _write_log_batch(self, entries: list):
+        """
+        Append log entries to the JSONL activity log.
+        
+        Args:
+            entries: (timestamp, activity, candidate_id, details) tuples
+        """
+        try:
+            # Append one JSON object per line; earlier entries are never reread
+            with open(self._log_path, 'ab') as f:
+                f.writelines(
+                    _json_dumps({
+                        "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                        "activity": activity,
+                        "candidate_id": candidate_id,
+                        "details": details
+                    }) + b"\n"
+                    for ts, activity, candidate_id, details in entries
+                )
         except Exception as e:
             print(f"Error logging activity: {e}")
 
@@ -252,28 +701,43 @@ class DataHandler:
         Returns:
             CSV formatted string
         """
-        if not candidates:
-            return ""
+        buffer = io.StringIO()
+        self._write_csv(candidates, buffer)
+        return buffer.getvalue()
+
+    def _write_csv(self, candidates: Iterable[Dict], out: TextIO) -> int:
+        """
+        Write candidate records as CSV rows to a text stream.
         
-        # Extract headers from first candidate's data
-        headers = list(candidates[0].get("data", {}).keys())
-        headers = ["anonymous_id", "timestamp"] + headers
+        Columns come from the first record's data; list values are joined
+        with ";" and the csv module takes care of quoting.
         
-        # Build CSV
-        csv_lines = [",".join(headers)]
-        for candidate in candidates:
-            row = [
-                candidate.get("anonymous_id", ""),
-                candidate.get("timestamp", ""),
-            ]
-            for header in headers[2:]:
-                value = candidate.get("data", {}).get(header, "")
-                if isinstance(value, list):
-                    value = ";".join(value)
-                row.append(str(value))
-            csv_lines.append(",".join(row))
+        Args:
+            candidates: Candidate dictionaries (any iterable, consumed once)
+            out: Text stream opened with newline=""
+            
+        Returns:
+            Number of rows written (excluding the header)
+        """
+        candidates = iter(candidates)
+        first = next(candidates, None)
+        if first is None:
+            return 0
+        
+        headers = list(first.get("data", {}).keys())
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(["anonymous_id", "timestamp", *headers])
         
-        return "\n".join(csv_lines)
+        count = 0
+        for candidate in chain((first,), candidates):
+            data = candidate.get("data", {})
+            row = [candidate.get("anonymous_id", ""), candidate.get("timestamp", "")]
+            for header in headers:
+                value = data.get(header, "")
+                row.append(";".join(map(str, value)) if isinstance(value, list) else value)
+            writer.writerow(row)
+            count += 1
+        return count
 
     def cleanup_old_data(self, days: int = 90) -> int:
         """
@@ -290,16 +754,24 @@ class DataHandler:
             cutoff_date = datetime.now() - timedelta(days=days)
             deleted_count = 0
             
-            for file in self.data_dir.glob("*.json"):
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                
-                file_timestamp = datetime.fromisoformat(data.get("timestamp", ""))
-                if file_timestamp < cutoff_date:
-                    file.unlink()
-                    deleted_count += 1
-                    self._log_activity("OLD_DATA_DELETED", data.get("anonymous_id"), 
-                                      f"Deleted data older than {days} days")
+            # Timestamps come from the index, which is compacted afterwards.
+            # Naive ISO timestamps sort as strings, so none are parsed.
+            cutoff = cutoff_date.isoformat()
+            kept = []
+            # The lock is held from the read to the rewrite so a concurrent
+            # save cannot be dropped from the compacted index
+            with self._index_lock:
+                for anon_id, entry in self._load_index().items():
+                    if entry["ts"] < cutoff:
+                        file = self._record_path(anon_id)
+                        if file is not None:
+                            file.unlink()
+                            deleted_count += 1
+                            self._log_activity("OLD_DATA_DELETED", anon_id, 
+                                              f"Deleted data older than {days} days")
+                    else:
+                        kept.append(entry)
+                self._write_index(kept)
             
             return deleted_count
         except Exception as e:
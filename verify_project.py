@@ -5,6 +5,7 @@ Verifies all project files are present and properly structured.
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -12,12 +13,23 @@ from pathlib import Path
 class ProjectVerifier:
     """Verify project structure and files."""
     
+    # Package name at the start of a requirements line
+    REQUIREMENT_NAME_PATTERN = re.compile(r"\s*([A-Za-z0-9_.\-]+)")
+    
     def __init__(self, project_root: str = "."):
         """Initialize verifier."""
         self.project_root = Path(project_root)
         self.errors = []
         self.warnings = []
         self.success = []
+        self._root_files = None
+    
+    def _root_file_stat(self, name: str):
+        """Stat of a file in the project root, or None (root is scanned once)."""
+        if self._root_files is None:
+            with os.scandir(self.project_root) as it:
+                self._root_files = {e.name: e.stat() for e in it if e.is_file()}
+        return self._root_files.get(name)
     
     def verify_all(self):
         """Run all verification checks."""
@@ -48,8 +60,7 @@ class ProjectVerifier:
         ]
         
         for file in core_files:
-            path = self.project_root / file
-            if path.exists():
+            if self._root_file_stat(file) is not None:
                 self.success.append(f"✓ Core file found: {file}")
             else:
                 self.errors.append(f"✗ Missing core file: {file}")
@@ -69,9 +80,9 @@ class ProjectVerifier:
         ]
         
         for file in doc_files:
-            path = self.project_root / file
-            if path.exists():
-                size = path.stat().st_size
+            st = self._root_file_stat(file)
+            if st is not None:
+                size = st.st_size
                 if size > 100:  # Sanity check: file has content
                     self.success.append(f"✓ Documentation: {file} ({size} bytes)")
                 else:
@@ -92,8 +103,7 @@ class ProjectVerifier:
         ]
         
         for file, required in config_files:
-            path = self.project_root / file
-            if path.exists():
+            if self._root_file_stat(file) is not None:
                 self.success.append(f"✓ Configuration: {file}")
             elif required:
                 self.errors.append(f"✗ Missing required: {file}")
@@ -156,10 +166,15 @@ class ProjectVerifier:
             else:
                 self.warnings.append(f"⚠ Only {len(deps)} packages in requirements.txt")
             
-            # Check for critical packages
+            # Check for critical packages by exact (case-insensitive) name
+            names = {
+                match.group(1).lower()
+                for match in map(self.REQUIREMENT_NAME_PATTERN.match, deps)
+                if match
+            }
             critical_packages = ['streamlit', 'openai', 'pydantic']
             for pkg in critical_packages:
-                if any(pkg.lower() in line.lower() for line in lines):
+                if pkg.lower() in names:
                     self.success.append(f"✓ Critical package found: {pkg}")
                 else:
                     self.errors.append(f"✗ Critical package missing: {pkg}")
@@ -175,21 +190,17 @@ class ProjectVerifier:
             if py_file.name.startswith("__"):
                 continue
             
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                with open(py_file, 'r', encoding='latin-1') as f:
-                    content = f.read()
+            # Checks run on the raw bytes; nothing needs decoding
+            content = py_file.read_bytes()
             
             # Check for docstrings
-            if '"""' in content or "'''" in content:
+            if b'"""' in content or b"'''" in content:
                 self.success.append(f"✓ {py_file.name} has docstrings")
             else:
                 self.warnings.append(f"⚠ {py_file.name} lacks docstrings")
             
             # Check for type hints
-            if "->" in content or ": " in content:
+            if b"->" in content or b": " in content:
                 self.success.append(f"✓ {py_file.name} has type hints")
             else:
                 self.warnings.append(f"⚠ {py_file.name} lacks type hints")